@@ -6,19 +6,23 @@
 import argparse
 import atexit
 import code
-import difflib
+import contextlib
 import errno
+import functools
 import getpass
+import heapq
 import importlib
 import json
 import logging
+import math
 import os
 import platform
 import re
 import shutil
 import sys
 import warnings
-from pprint import pformat, pprint
+from itertools import islice
+from multiprocessing.pool import ThreadPool
 from rlcompleter import Completer
 
 from tqdm import tqdm
@@ -30,10 +34,23 @@ except ImportError:
 else:
     READLINE = True
 
+try:
+    import orjson
+except ImportError:
+    ORJSON = False
+else:
+    ORJSON = True
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    RAPIDFUZZ = False
+else:
+    RAPIDFUZZ = True
+
 from . import Project, get_project, index, init_project
 from .common import config
 from .common.configobj import Section, flatten_errors
-from .common.crypt import get_crypt_context, get_keyring, parse_pwhash
 from .contrib.filterparse import parse_filter_arg
 from .contrib.import_export import _SchemaPathEvaluationError, export_jobs
 from .contrib.utility import add_verbosity_argument, prompt_password, query_yes_no
@@ -48,20 +65,6 @@ from .errors import (
 from .sync import DocSync, FileSync
 from .version import __version__
 
-try:
-    from .common.host import get_client, get_credentials, get_database, make_uri
-except ImportError:
-    HOST = False
-else:
-    HOST = True
-
-PW_ENCRYPTION_SCHEMES = ["None"]
-DEFAULT_PW_ENCRYPTION_SCHEME = PW_ENCRYPTION_SCHEMES[0]
-if get_crypt_context() is not None:
-    PW_ENCRYPTION_SCHEMES.extend(get_crypt_context().schemes())
-    DEFAULT_PW_ENCRYPTION_SCHEME = get_crypt_context().default_scheme()
-
-
 CONFIG_HOST_DEFAULTS = {
     "url": "mongodb://localhost",
     "username": getpass.getuser(),
@@ -73,6 +76,9 @@ CONFIG_HOST_DEFAULTS = {
 CONFIG_HOST_CHOICES = {"auth_mechanism": ("none", "SCRAM-SHA-1", "SSL-x509")}
 
 
+PASSWORD_LINE_REGEX = re.compile(r"^([ \t]*)password.*$", re.MULTILINE)
+
+
 MSG_SYNC_SPECIFY_KEY = """
 Synchronization conflict occurred, no strategy defined to synchronize keys:
 {keys}
@@ -121,6 +127,30 @@ Synchronize your project with the temporary project, for example with:
 )
 
 
+# Pretty printing with at least this depth uses indented JSON instead of pprint.
+PRETTY_JSON_MIN_DEPTH = 8
+
+# Log levels selected by the verbosity argument.
+LOG_LEVELS = (
+    logging.CRITICAL,
+    logging.ERROR,
+    logging.WARNING,
+    logging.INFO,
+    logging.MORE,
+    logging.DEBUG,
+)
+
+# Messages for errors raised by the subcommand handlers, keyed by error type.
+ERROR_MESSAGES = {
+    KeyboardInterrupt: "\nInterrupted.",
+    RuntimeWarning: "Warning: {}",
+    Exception: "Error: {}",
+}
+
+# Maximum number of skipped keys listed at the end of a sync.
+MAX_SKIPPED_KEYS_SHOWN = 50
+
+
 warnings.simplefilter("default")
 
 
@@ -128,6 +158,126 @@ def _print_err(msg=None, *args):
     print(msg, *args, file=sys.stderr)
 
 
+@functools.lru_cache(maxsize=8)
+def _get_project_at(root):
+    return get_project(root=root)
+
+
+def _get_project(root=None):
+    """Find a project in or above the given root (or current working) directory.
+
+    Projects are cached per canonical root directory, so that repeated
+    lookups within the same command line invocation, e.g., for the source
+    and destination of a sync, do not re-read the configuration. The cache
+    is cleared at the start of every call of :func:`main`.
+    """
+    return _get_project_at(os.path.realpath(os.getcwd() if root is None else root))
+
+
+def _has_nonfinite_floats(data):
+    """Return True if data contains NaN or infinite floats."""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_nonfinite_floats(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_nonfinite_floats(value) for value in data)
+    return False
+
+
+def _dumps_json(doc):
+    """Encode a JSON document compactly as bytes, using orjson if available."""
+    if ORJSON:
+        try:
+            blob = orjson.dumps(doc)
+        except TypeError:
+            # orjson is stricter than the standard library, e.g., with respect
+            # to very large integers, so we fall back to the json module.
+            pass
+        else:
+            # orjson encodes NaN and infinities as null instead of raising.
+            if b"null" not in blob or not _has_nonfinite_floats(doc):
+                return blob
+    return json.dumps(doc, separators=(",", ":")).encode()
+
+
+def _loads_json(data):
+    """Decode a JSON document, using orjson if available."""
+    if ORJSON:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # orjson rejects some input accepted by the json module, e.g.,
+            # NaN and very large integers.
+            pass
+    return json.loads(data)
+
+
+def _pformat(data, depth):
+    """Pretty format data up to the given depth.
+
+    Truncation at a small depth requires pprint, otherwise the data is
+    formatted as indented JSON, which is much faster for large documents.
+    """
+    if depth < PRETTY_JSON_MIN_DEPTH:
+        from pprint import pformat
+
+        return pformat(data, depth=depth)
+    return json.dumps(data, indent=2, sort_keys=True)
+
+
+class _BufferedStdout:
+    """Collect output to stdout and write it in large chunks.
+
+    Writing many short lines with print is dominated by the overhead per
+    call. This context manager encodes lines into a buffer instead, which
+    is written to stdout whenever it exceeds the chunk size and on exit.
+    """
+
+    def __init__(self, chunk_size=1 << 16):
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._linesep = os.linesep.encode()
+
+    def __enter__(self):
+        sys.stdout.flush()
+        self._encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+        self._out = getattr(sys.stdout, "buffer", None)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def write(self, data):
+        """Write bytes followed by a line separator."""
+        self._buffer += data
+        self._buffer += self._linesep
+        if len(self._buffer) > self._chunk_size:
+            self.flush()
+
+    def print(self, text):
+        """Write a line of text."""
+        self.write(str(text).encode(self._encoding, errors="replace"))
+
+    def flush(self):
+        """Write the buffered output to stdout."""
+        if self._out is None:
+            # Text streams without a binary buffer, e.g., io.StringIO.
+            sys.stdout.write(self._buffer.decode(self._encoding, errors="replace"))
+            sys.stdout.flush()
+        else:
+            self._out.write(self._buffer)
+            self._out.flush()
+        self._buffer.clear()
+
+
+def _print_json_lines(docs):
+    """Write documents to stdout as newline-delimited JSON in batched writes."""
+    with _BufferedStdout() as out:
+        for doc in docs:
+            out.write(_dumps_json(doc))
+
+
 def _fmt_bytes(nbytes, suffix="B"):
     """Format number of bytes.
 
@@ -149,11 +299,9 @@ def _passlib_available():
         return True
 
 
-def _hide_password(line):
-    if line.strip().startswith("password"):
-        return " " * line.index("password") + "password = ***"
-    else:
-        return line
+def _hide_passwords(lines):
+    """Join configuration lines, hiding the values of all password keys."""
+    return PASSWORD_LINE_REGEX.sub(r"\1password = ***", "\n".join(lines))
 
 
 def _prompt_for_new_password(attempts=3):
@@ -170,6 +318,19 @@ def _prompt_for_new_password(attempts=3):
         raise ValueError("Too many failed attempts.")
 
 
+def _get_pw_encryption_schemes():
+    """Return the available password encryption schemes and the default scheme.
+
+    The crypt module is only imported on demand, since it imports passlib.
+    """
+    from .common.crypt import get_crypt_context
+
+    crypt_context = get_crypt_context()
+    if crypt_context is None:
+        return ("None",), "None"
+    return ("None",) + tuple(crypt_context.schemes()), crypt_context.default_scheme()
+
+
 def _update_password(config, hostname, scheme=None, new_pw=None):
     def hashpw(pw):
         if scheme is None:
@@ -177,6 +338,9 @@ def _update_password(config, hostname, scheme=None, new_pw=None):
         else:
             return get_crypt_context().encrypt(pw, scheme=scheme)
 
+    from .common.crypt import get_crypt_context
+    from .common.host import get_credentials, get_database
+
     hostcfg = config["hosts"][hostname]
     hostcfg["password"] = get_credentials(hostcfg)
     db_auth = get_database(
@@ -190,21 +354,102 @@ def _update_password(config, hostname, scheme=None, new_pw=None):
 
 
 def _read_index(project, fn_index=None):
-    if fn_index is not None:
-        _print_err(f"Reading index from file '{fn_index}'...")
-        with open(fn_index) as file_descriptor:
-            return [json.loads(line) for line in file_descriptor]
+    """Lazily read the documents of an index file.
 
+    The file is expected to contain one JSON document per line. Files that
+    contain a single JSON array of documents are supported as well and are
+    parsed incrementally if ijson is installed.
+    """
+    if fn_index is None:
+        return None
+    _print_err(f"Reading index from file '{fn_index}'...")
+
+    def _read():
+        with open(fn_index, "rb") as file_descriptor:
+            head = file_descriptor.read(1)
+            while head.isspace():
+                head = file_descriptor.read(1)
+            start = file_descriptor.tell() - len(head)
+            file_descriptor.seek(start)
+            if head == b"[":
+                try:
+                    import ijson
+                except ImportError:
+                    yield from json.load(file_descriptor)
+                    return
+                num_read = 0
+                try:
+                    for doc in ijson.items(file_descriptor, "item", use_float=True):
+                        num_read += 1
+                        yield doc
+                except ijson.JSONError:
+                    # ijson rejects NaN and infinities, which the json module
+                    # accepts, so the remaining documents are read with json.
+                    file_descriptor.seek(start)
+                    yield from islice(json.load(file_descriptor), num_read, None)
+            else:
+                for line in file_descriptor:
+                    if line.strip():
+                        yield _loads_json(line)
+
+    return _read()
+
+
+def _find_close_job_ids(job_id, job_ids, n=3, cutoff=0.6):
+    """Return up to n job ids whose prefixes closely match the given job id."""
+    prefixes = [_id[: len(job_id)] for _id in job_ids]
+    if RAPIDFUZZ:
+        matches = process.extract(
+            job_id, prefixes, scorer=fuzz.ratio, limit=n, score_cutoff=100 * cutoff
+        )
+        return [job_ids[index] for _, _, index in matches]
+    import difflib
+
+    close_matches = difflib.get_close_matches(job_id, prefixes, n=n, cutoff=cutoff)
+    return [
+        _id
+        for match in close_matches
+        for _id, prefix in zip(job_ids, prefixes)
+        if prefix == match
+    ][:n]
 
-def _open_job_by_id(project, job_id):
-    """Attempt to open a job by id and provide user feedback on error."""
+
+def _find_job_ids_for_lookup(project, ids):
+    """Return all job ids if more than one abbreviated id needs to be resolved.
+
+    Passing the result to :func:`_open_job_by_id` avoids scanning the
+    workspace once per abbreviated id.
+    """
+    if sum(len(_id) < 32 for _id in ids) > 1:
+        return project._find_job_ids()
+    return None
+
+
+def _open_job_by_id(project, job_id, job_ids=None):
+    """Attempt to open a job by id and provide user feedback on error.
+
+    If provided, the list of all job ids of the project is used to resolve
+    abbreviated ids and to suggest close matches.
+    """
     try:
+        if job_ids is not None and len(job_id) < 32:
+            matches = [_id for _id in job_ids if _id.startswith(job_id)]
+            if len(matches) == 1:
+                return project.open_job(id=matches[0])
+            elif len(matches) > 1:
+                raise LookupError(job_id)
+            else:
+                raise KeyError(job_id)
         return project.open_job(id=job_id)
     except KeyError:
-        close_matches = difflib.get_close_matches(
-            job_id, [job.id[: len(job_id)] for job in project.find_jobs()]
-        )
         msg = f"Did not find job corresponding to id '{job_id}'."
+        if len(job_id) >= 32:
+            # A full id that does not exist is not a typo of an abbreviated
+            # id, so we can skip scanning the workspace for suggestions.
+            raise KeyError(msg)
+        if job_ids is None:
+            job_ids = project._find_job_ids()
+        close_matches = _find_close_job_ids(job_id, job_ids)
         if len(close_matches) == 1:
             msg += " Did you mean '{}'?".format(close_matches[0])
         elif len(close_matches) > 1:
@@ -221,7 +466,11 @@ def _open_job_by_id(project, job_id):
 
 def find_with_filter_or_none(args):
     """Return a filtered subset of jobs or None."""
-    if args.job_id or args.filter or args.doc_filter:
+    if (
+        getattr(args, "job_id", None)
+        or getattr(args, "filter", None)
+        or getattr(args, "doc_filter", None)
+    ):
         return find_with_filter(args)
     else:
         return None
@@ -229,33 +478,34 @@ def find_with_filter_or_none(args):
 
 def find_with_filter(args):
     """Return a filtered subset of jobs."""
+    filter = getattr(args, "filter", None)
+    doc_filter = getattr(args, "doc_filter", None)
     if getattr(args, "job_id", None):
-        if args.filter or args.doc_filter:
+        if filter or doc_filter:
             raise ValueError("Can't provide both 'job-id' and filter arguments!")
         else:
             return args.job_id
 
-    project = get_project()
+    project = _get_project()
     if hasattr(args, "index"):
         index = _read_index(project, args.index)
     else:
         index = None
 
-    f = parse_filter_arg(args.filter)
-    df = parse_filter_arg(args.doc_filter)
-    return get_project()._find_job_ids(index=index, filter=f, doc_filter=df)
+    f = parse_filter_arg(filter) if filter else None
+    df = parse_filter_arg(doc_filter) if doc_filter else None
+    return project._find_job_ids(index=index, filter=f, doc_filter=df)
 
 
 def main_project(args):
     """Handle project subcommand."""
-    project = get_project()
+    project = _get_project()
     if args.access:
         fn = project.create_access_module()
         _print_err(f"Created access module '{fn}'.")
         return
     if args.index:
-        for doc in project.index():
-            print(json.dumps(doc))
+        _print_json_lines(project.index())
         return
     if args.workspace:
         print(project.workspace())
@@ -265,13 +515,10 @@ def main_project(args):
 
 def main_job(args):
     """Handle job subcommand."""
-    project = get_project()
-    if args.statepoint == "-":
-        sp = input()
-    else:
-        sp = args.statepoint
+    project = _get_project()
+    sp = input() if args.statepoint == "-" else args.statepoint
     try:
-        statepoint = json.loads(sp)
+        statepoint = _loads_json(sp)
     except ValueError:
         _print_err(f"Error while reading statepoint: '{sp}'")
         raise
@@ -286,75 +533,127 @@ def main_job(args):
 
 def main_statepoint(args):
     """Handle statepoint subcommand."""
-    project = get_project()
+    project = _get_project()
     if args.job_id:
-        jobs = (_open_job_by_id(project, jid) for jid in args.job_id)
+        job_ids = _find_job_ids_for_lookup(project, args.job_id)
+        statepoints = (
+            _open_job_by_id(project, jid, job_ids).statepoint() for jid in args.job_id
+        )
     else:
-        jobs = project
-    for job in jobs:
-        if args.pretty:
-            pprint(job.statepoint(), depth=args.pretty)
-        else:
-            print(json.dumps(job.statepoint(), indent=args.indent, sort_keys=args.sort))
+        # The state points of all jobs are read from the project's state point
+        # index instead of opening a job handle for each job. The jobs are
+        # listed in the same order as by iterating over the project.
+        statepoints_by_id = {doc["_id"]: doc["sp"] for doc in project._sp_index()}
+        statepoints = (statepoints_by_id[_id] for _id in project._find_job_ids())
+    with _BufferedStdout() as out:
+        for statepoint in statepoints:
+            if args.pretty:
+                out.print(_pformat(statepoint, args.pretty))
+            else:
+                out.print(
+                    json.dumps(statepoint, indent=args.indent, sort_keys=args.sort)
+                )
 
 
 def main_document(args):
     """Handle document subcommand."""
-    project = get_project()
-    for job_id in find_with_filter(args):
-        job = _open_job_by_id(project, job_id)
-        if args.pretty:
-            pprint(job.document(), depth=args.pretty)
-        else:
-            print(json.dumps(job.document(), indent=args.indent, sort_keys=args.sort))
+    project = _get_project()
+    ids = list(find_with_filter(args))
+    job_ids = _find_job_ids_for_lookup(project, ids)
+    with _BufferedStdout() as out:
+        for job_id in ids:
+            job = _open_job_by_id(project, job_id, job_ids)
+            if args.pretty:
+                out.print(_pformat(job.document(), args.pretty))
+            else:
+                out.print(
+                    json.dumps(job.document(), indent=args.indent, sort_keys=args.sort)
+                )
+
+
+def _map_jobs(func, iterable, parallel=None):
+    """Apply func to all items, optionally using a pool of threads.
+
+    Results are yielded in order. Set parallel to True to use as many
+    threads as there are processing units, or to an int to specify the
+    number of threads.
+    """
+    if parallel:
+        with ThreadPool(None if parallel is True else parallel) as pool:
+            yield from pool.imap(func, iterable)
+    else:
+        yield from map(func, iterable)
 
 
 def main_remove(args):
     """Handle remove subcommand."""
-    project = get_project()
-    for job_id in args.job_id:
-        job = _open_job_by_id(project, job_id)
-        if args.interactive and not query_yes_no(
-            "Are you sure you want to {action} job with id '{job.id}'?".format(
-                action="clear" if args.clear else "remove", job=job
-            ),
-            default="no",
-        ):
-            continue
+    project = _get_project()
+    job_ids = _find_job_ids_for_lookup(project, args.job_id)
+    jobs = [
+        (job_id, _open_job_by_id(project, job_id, job_ids)) for job_id in args.job_id
+    ]
+    if args.interactive:
+        jobs = [
+            (job_id, job)
+            for job_id, job in jobs
+            if query_yes_no(
+                "Are you sure you want to {action} job with id '{job.id}'?".format(
+                    action="clear" if args.clear else "remove", job=job
+                ),
+                default="no",
+            )
+        ]
+
+    def _remove(item):
+        job_id, job = item
         if args.clear:
             job.clear()
         else:
             job.remove()
-        if args.verbose:
-            print(job_id)
+        return job_id
+
+    with _BufferedStdout() as out:
+        for job_id in _map_jobs(_remove, jobs, args.parallel):
+            if args.verbose:
+                out.print(job_id)
 
 
 def main_move(args):
     """Handle move subcommand."""
-    project = get_project()
-    dst_project = get_project(root=args.project)
-    for job_id in args.job_id:
+    project = _get_project()
+    dst_project = _get_project(root=args.project)
+    job_ids = _find_job_ids_for_lookup(project, args.job_id)
+
+    def _move(job_id):
+        job = _open_job_by_id(project, job_id, job_ids)
         try:
-            job = _open_job_by_id(project, job_id)
             job.move(dst_project)
         except DestinationExistsError:
-            _print_err(f"Destination already exists: '{job}' in '{dst_project}'.")
+            return f"Destination already exists: '{job}' in '{dst_project}'."
         else:
-            _print_err(f"Moved '{job}' to '{dst_project}'.")
+            return f"Moved '{job}' to '{dst_project}'."
+
+    for msg in _map_jobs(_move, args.job_id, args.parallel):
+        _print_err(msg)
 
 
 def main_clone(args):
     """Handle clone subcommand."""
-    project = get_project()
-    dst_project = get_project(root=args.project)
-    for job_id in args.job_id:
+    project = _get_project()
+    dst_project = _get_project(root=args.project)
+    job_ids = _find_job_ids_for_lookup(project, args.job_id)
+
+    def _clone(job_id):
+        job = _open_job_by_id(project, job_id, job_ids)
         try:
-            job = _open_job_by_id(project, job_id)
             dst_project.clone(job)
         except DestinationExistsError:
-            _print_err(f"Destination already exists: '{job}' in '{dst_project}'.")
+            return f"Destination already exists: '{job}' in '{dst_project}'."
         else:
-            _print_err(f"Cloned '{job}' to '{dst_project}'.")
+            return f"Cloned '{job}' to '{dst_project}'."
+
+    for msg in _map_jobs(_clone, args.job_id, args.parallel):
+        _print_err(msg)
 
 
 def main_index(args):
@@ -365,13 +664,12 @@ def main_index(args):
     if args.tags:
         args.tags = set(args.tags)
         _print_err("Provided tags: {}".format(", ".join(sorted(args.tags))))
-    for doc in index(root=args.root, tags=args.tags, raise_on_error=args.debug):
-        print(json.dumps(doc))
+    _print_json_lines(index(root=args.root, tags=args.tags, raise_on_error=args.debug))
 
 
 def main_find(args):
     """Handle find subcommand."""
-    project = get_project()
+    project = _get_project()
 
     len_id = 6
     if args.one_line:
@@ -392,26 +690,27 @@ def main_find(args):
                 s = json.dumps(s, sort_keys=True)
             return f"{_id[:len_id]} {cat}\t{s}"
         else:
-            return pformat(s, depth=args.pretty)
+            return _pformat(s, args.pretty)
 
     try:
-        for job_id in find_with_filter(args):
-            print(job_id)
-            job = project.open_job(id=job_id)
-
-            if args.sp is not None:
-                statepoint = job.statepoint()
-                if len(args.sp) != 0:
-                    statepoint = {
-                        key: statepoint[key] for key in args.sp if key in statepoint
-                    }
-                print(format_lines("sp ", job_id, statepoint))
-
-            if args.doc is not None:
-                doc = job.document()
-                if len(args.doc) != 0:
-                    doc = {key: doc[key] for key in args.doc if key in doc}
-                print(format_lines("sp ", job_id, doc))
+        with _BufferedStdout() as out:
+            for job_id in find_with_filter(args):
+                out.print(job_id)
+                job = project.open_job(id=job_id)
+
+                if args.sp is not None:
+                    statepoint = job.statepoint()
+                    if len(args.sp) != 0:
+                        statepoint = {
+                            key: statepoint[key] for key in args.sp if key in statepoint
+                        }
+                    out.print(format_lines("sp ", job_id, statepoint))
+
+                if args.doc is not None:
+                    doc = job.document()
+                    if len(args.doc) != 0:
+                        doc = {key: doc[key] for key in args.doc if key in doc}
+                    out.print(format_lines("sp ", job_id, doc))
     except OSError as error:
         if error.errno == errno.EPIPE:
             sys.stderr.close()
@@ -421,12 +720,17 @@ def main_find(args):
 
 def main_diff(args):
     """Handle diff subcommand."""
-    project = get_project()
+    from pprint import pprint
 
-    jobs = find_with_filter_or_none(args)
-    jobs = (
-        (_open_job_by_id(project, job) for job in jobs) if jobs is not None else project
-    )
+    project = _get_project()
+
+    ids = find_with_filter_or_none(args)
+    if ids is None:
+        jobs = project
+    else:
+        ids = list(ids)
+        job_ids = _find_job_ids_for_lookup(project, ids)
+        jobs = (_open_job_by_id(project, _id, job_ids) for _id in ids)
 
     diff = diff_jobs(*jobs)
 
@@ -437,12 +741,12 @@ def main_diff(args):
 
 def main_view(args):
     """Handle view subcommand."""
-    project = get_project()
+    project = _get_project()
     project.create_linked_view(
         prefix=args.prefix,
         path=args.path,
         job_ids=find_with_filter(args),
-        index=_read_index(args.index),
+        index=_read_index(project, args.index),
     )
 
 
@@ -451,12 +755,13 @@ def main_init(args):
     project = init_project(
         name=args.project_id, root=os.getcwd(), workspace=args.workspace
     )
+    _get_project_at.cache_clear()
     _print_err(f"Initialized project '{project}'.")
 
 
 def main_schema(args):
     """Handle schema subcommand."""
-    project = get_project()
+    project = _get_project()
     print(
         project.detect_schema(
             exclude_const=args.exclude_const, subset=find_with_filter_or_none(args)
@@ -513,9 +818,9 @@ def main_sync(args):
     # Setup synchronization process
     #
 
-    source = get_project(root=args.source)
+    source = _get_project(root=args.source)
     try:
-        destination = get_project(root=args.destination)
+        destination = _get_project(root=args.destination)
     except LookupError:
         if args.allow_workspace:
             destination = Project(
@@ -550,10 +855,10 @@ def main_sync(args):
         doc_sync = DocSync.ByKey(lambda key: False)
     elif args.key:
         try:
-            re.compile(args.key)
+            pattern = re.compile(args.key)
         except re.error as e:
             raise RuntimeError(f"Illegal regular expression '{args.key}': '{e}'.")
-        doc_sync = DocSync.ByKey(lambda key: re.match(args.key, key))
+        doc_sync = DocSync.ByKey(pattern.match)
     else:
         doc_sync = DocSync.ByKey()
 
@@ -617,8 +922,14 @@ def main_sync(args):
     except FileSyncConflict as error:
         _print_err(MSG_SYNC_FILE_CONFLICT.format(files=error))
     else:
-        if doc_sync.skipped_keys:
-            _print_err("Skipped key(s):", ", ".join(sorted(doc_sync.skipped_keys)))
+        skipped_keys = doc_sync.skipped_keys
+        if skipped_keys:
+            if len(skipped_keys) > MAX_SKIPPED_KEYS_SHOWN:
+                shown = heapq.nsmallest(MAX_SKIPPED_KEYS_SHOWN, skipped_keys)
+                shown.append("... ({} more)".format(len(skipped_keys) - len(shown)))
+            else:
+                shown = sorted(skipped_keys)
+            _print_err("Skipped key(s):", ", ".join(shown))
         _print_err("Done.")
         return
     raise RuntimeWarning("Synchronization aborted.")
@@ -657,7 +968,7 @@ def _main_import_interactive(project, origin, args):
                 banner=SHELL_BANNER_INTERACTIVE_IMPORT.format(
                     python_version=sys.version,
                     signac_version=__version__,
-                    project_id=project.get_id(),
+                    project_id=project.id,
                     job_banner="",
                     root_path=project.root_directory(),
                     workspace_path=project.workspace(),
@@ -715,7 +1026,7 @@ def main_import(args):
             "Cannot use '--move' in combination with '--sync' or '--sync-interactive'."
         )
 
-    project = get_project()
+    project = _get_project()
     if args.sync_interactive:
         paths = _main_import_interactive(project, args.origin, args)
     else:
@@ -737,7 +1048,7 @@ def main_export(args):
         )
     copytree = shutil.move if args.move else None
 
-    project = get_project()
+    project = _get_project()
     jobs = [project.open_job(id=job_id) for job_id in find_with_filter(args)]
 
     paths = {}
@@ -761,7 +1072,7 @@ def main_export(args):
 
 def main_update_cache(args):
     """Handle update-cache subcommand."""
-    project = get_project()
+    project = _get_project()
     _print_err("Updating cache...")
     n = project.update_cache()
     if n is None:
@@ -770,6 +1081,22 @@ def main_update_cache(args):
         _print_err(f"Updated cache (size={n}).")
 
 
+def _find_local_config_files():
+    """Return the configuration files in the current working directory."""
+    return [fn for fn in config.CONFIG_FILENAMES if os.path.isfile(fn)]
+
+
+def _read_local_config():
+    """Read and merge the local configuration files, if any."""
+    fns = _find_local_config_files()
+    if not fns:
+        return None
+    cfg = config.read_config_file(fns[0])
+    for fn in fns[1:]:
+        cfg.merge(config.read_config_file(fn))
+    return cfg
+
+
 # UNCOMMENT THE FOLLOWING BLOCK WHEN THE FIRST MIGRATION IS INTRODUCED.
 # def main_migrate(args):
 #     "Migrate the project's schema to the current schema version."
@@ -818,16 +1145,10 @@ def verify_config(cfg, preserve_errors=True):
 
 def main_config_show(args):
     """Handle config show subcommand."""
-    cfg = None
     if args.local and args.globalcfg:
         raise ValueError("You can specify either -l/--local or -g/--global, not both.")
     elif args.local:
-        for fn in config.CONFIG_FILENAMES:
-            if os.path.isfile(fn):
-                if cfg is None:
-                    cfg = config.read_config_file(fn)
-                else:
-                    cfg.merge(config.read_config_file(fn))
+        cfg = _read_local_config()
     elif args.globalcfg:
         cfg = config.read_config_file(config.FN_CONFIG)
     else:
@@ -843,30 +1164,25 @@ def main_config_show(args):
             mode = ""
         _print_err(f"Did not find a{mode}configuration file.")
         return
-    for key in args.key:
-        for kt in key.split("."):
-            cfg = cfg.get(kt)
-            if cfg is None:
-                break
+    # All keys are combined into a single path, e.g., "hosts localhost.url"
+    # is equivalent to "hosts.localhost.url".
+    for kt in (kt for key in args.key for kt in key.split(".")):
+        if not isinstance(cfg, Section):
+            cfg = None
+            break
+        cfg = cfg.get(kt)
     if not isinstance(cfg, Section):
         print(cfg)
     else:
-        for line in config.Config(cfg).write():
-            print(_hide_password(line))
+        print(_hide_passwords(config.Config(cfg).write()))
 
 
 def main_config_verify(args):
     """Handle config verify subcommand."""
-    cfg = None
     if args.local and args.globalcfg:
         raise ValueError("You can specify either -l/--local or -g/--global, not both.")
     elif args.local:
-        for fn in config.CONFIG_FILENAMES:
-            if os.path.isfile(fn):
-                if cfg is None:
-                    cfg = config.read_config_file(fn)
-                else:
-                    cfg.merge(config.read_config_file(fn))
+        cfg = _read_local_config()
     elif args.globalcfg:
         cfg = config.read_config_file(config.FN_CONFIG)
     else:
@@ -894,9 +1210,8 @@ def main_config_set(args):
     if args.local and args.globalcfg:
         raise ValueError("You can specify either -l/--local or -g/--global, not both.")
     elif args.local:
-        for fn_config in config.CONFIG_FILENAMES:
-            if os.path.isfile(fn_config):
-                break
+        # Default to the last file name if no local configuration exists yet.
+        fn_config = next(iter(_find_local_config_files()), config.CONFIG_FILENAMES[-1])
     elif args.globalcfg:
         fn_config = config.FN_CONFIG
     else:
@@ -934,10 +1249,14 @@ def main_config_set(args):
 def main_config_host(args):
     """Handle config host subcommand."""
     if args.update_pw is True:
-        args.update_pw = DEFAULT_PW_ENCRYPTION_SCHEME
-    if not HOST:
+        _, args.update_pw = _get_pw_encryption_schemes()
+    try:
+        from pymongo.uri_parser import parse_uri
+
+        from .common.host import get_client, get_credentials, make_uri
+    except ImportError:
         raise ImportError("pymongo is required for host configuration!")
-    from pymongo.uri_parser import parse_uri
+    from .common.crypt import get_keyring, parse_pwhash
 
     if not (args.local or args.globalcfg):
         args.globalcfg = True
@@ -945,9 +1264,8 @@ def main_config_host(args):
     if args.local and args.globalcfg:
         raise ValueError("You can specify either -l/--local or -g/--global, not both.")
     elif args.local:
-        for fn_config in config.CONFIG_FILENAMES:
-            if os.path.isfile(fn_config):
-                break
+        # Default to the last file name if no local configuration exists yet.
+        fn_config = next(iter(_find_local_config_files()), config.CONFIG_FILENAMES[-1])
     elif args.globalcfg:
         fn_config = config.FN_CONFIG
     else:
@@ -963,7 +1281,8 @@ def main_config_host(args):
     def hostcfg():
         return cfg.setdefault("hosts", {}).setdefault(args.hostname, {})
 
-    if sum((args.test, args.remove, args.show_pw)) > 1:
+    flags = bool(args.test) | bool(args.remove) << 1 | bool(args.show_pw) << 2
+    if flags & (flags - 1):  # more than one bit set
         raise ValueError(
             "Please select only one of the following options: "
             "[--test | -r/--remove | --show-pw]."
@@ -1075,8 +1394,7 @@ def main_config_host(args):
 
     _print_err(f"Configured host '{args.hostname}':")
     print("[hosts]")
-    for line in config.Config({args.hostname: hostcfg()}).write():
-        print(_hide_password(line))
+    print(_hide_passwords(config.Config({args.hostname: hostcfg()}).write()))
 
 
 def main_shell(args):
@@ -1087,7 +1405,7 @@ def main_shell(args):
         )
 
     try:
-        project = get_project()
+        project = _get_project()
     except LookupError:
         print("signac", __version__)
         print("No project within this directory.")
@@ -1176,27 +1494,21 @@ def main_shell(args):
             )
 
 
-def main():
-    """Provide command line interface."""
-    parser = argparse.ArgumentParser(
-        description="signac aids in the management, access and analysis of "
-        "large-scale computational investigations."
-    )
-    parser.add_argument(
-        "--debug", action="store_true", help="Show traceback on error for debugging."
-    )
-    parser.add_argument(
-        "--version", action="store_true", help="Display the version number and exit."
-    )
-    add_verbosity_argument(parser, default=2)
-    parser.add_argument(
-        "-y",
-        "--yes",
-        action="store_true",
-        help="Answer all questions with yes. Useful for scripted interaction.",
-    )
-    subparsers = parser.add_subparsers()
+def _add_selection_args(group, filter_help, doc_filter_help, job_id_help=None):
+    """Add the job selection arguments to a parser or argument group.
 
+    The job id argument is only added if its help text is provided. Omitted
+    arguments are not set on the namespace, see :func:`find_with_filter`.
+    """
+    kwargs = dict(type=str, nargs="+", default=argparse.SUPPRESS)
+    group.add_argument("-f", "--filter", help=filter_help, **kwargs)
+    group.add_argument("-d", "--doc-filter", help=doc_filter_help, **kwargs)
+    if job_id_help is not None:
+        group.add_argument("-j", "--job-id", help=job_id_help, **kwargs)
+
+
+def _build_init(subparsers):
+    """Add the init subcommand parser."""
     parser_init = subparsers.add_parser("init")
     parser_init.add_argument(
         "project_id", type=str, help="Initialize a project with the given project id."
@@ -1208,8 +1520,10 @@ def main():
         default="workspace",
         help="The path to the workspace directory.",
     )
-    parser_init.set_defaults(func=main_init)
 
+
+def _build_project(subparsers):
+    """Add the project subcommand parser."""
     parser_project = subparsers.add_parser("project")
     parser_project.add_argument(
         "-w",
@@ -1226,8 +1540,10 @@ def main():
     parser_project.add_argument(
         "-a", "--access", action="store_true", help="Create access module for indexing."
     )
-    parser_project.set_defaults(func=main_project)
 
+
+def _build_job(subparsers):
+    """Add the job subcommand parser."""
     parser_job = subparsers.add_parser("job")
     parser_job.add_argument(
         "statepoint",
@@ -1248,8 +1564,10 @@ def main():
         action="store_true",
         help="Create the job's workspace directory if necessary.",
     )
-    parser_job.set_defaults(func=main_job)
 
+
+def _build_statepoint(subparsers):
+    """Add the statepoint subcommand parser."""
     parser_statepoint = subparsers.add_parser(
         "statepoint",
         description="Print the statepoint(s) corresponding to one or more job ids.",
@@ -1268,7 +1586,8 @@ def main():
         const=3,
         help="Print state point in pretty format. "
         "An optional argument to this flag specifies the maximal "
-        "depth a state point is printed.",
+        "depth a state point is printed. A depth of {} or more prints "
+        "the state point as indented JSON.".format(PRETTY_JSON_MIN_DEPTH),
     )
     parser_statepoint.add_argument(
         "-i",
@@ -1284,8 +1603,10 @@ def main():
         action="store_true",
         help="Sort the state point keys for output.",
     )
-    parser_statepoint.set_defaults(func=main_statepoint)
 
+
+def _build_diff(subparsers):
+    """Add the diff subcommand parser."""
     parser_diff = subparsers.add_parser(
         "diff", description="Find the difference among job state points."
     )
@@ -1313,22 +1634,15 @@ def main():
         const="2",
         help="Specify the indentation of the JSON formatted state point.",
     )
-    parser_diff.add_argument(
-        "-f",
-        "--filter",
-        type=str,
-        nargs="+",
-        help="Limit the diff to jobs matching this state point filter.",
+    _add_selection_args(
+        parser_diff,
+        filter_help="Limit the diff to jobs matching this state point filter.",
+        doc_filter_help="Show documents of jobs matching this document filter.",
     )
-    parser_diff.add_argument(
-        "-d",
-        "--doc-filter",
-        type=str,
-        nargs="+",
-        help="Show documents of jobs matching this document filter.",
-    )
-    parser_diff.set_defaults(func=main_diff)
 
+
+def _build_document(subparsers):
+    """Add the document subcommand parser."""
     parser_document = subparsers.add_parser(
         "document",
         description="Print the document(s) corresponding to one or more job ids.",
@@ -1347,7 +1661,8 @@ def main():
         const=3,
         help="Print document in pretty format. "
         "An optional argument to this flag specifies the maximal "
-        "depth a document is printed.",
+        "depth a document is printed. A depth of {} or more prints "
+        "the document as indented JSON.".format(PRETTY_JSON_MIN_DEPTH),
     )
     parser_document.add_argument(
         "-i",
@@ -1363,25 +1678,18 @@ def main():
         action="store_true",
         help="Sort the document keys for output in JSON format.",
     )
-    parser_document.add_argument(
-        "-f",
-        "--filter",
-        type=str,
-        nargs="+",
-        help="Show documents of jobs matching this state point filter.",
-    )
-    parser_document.add_argument(
-        "-d",
-        "--doc-filter",
-        type=str,
-        nargs="+",
-        help="Show documents of job matching this document filter.",
+    _add_selection_args(
+        parser_document,
+        filter_help="Show documents of jobs matching this state point filter.",
+        doc_filter_help="Show documents of job matching this document filter.",
     )
     parser_document.add_argument(
         "--index", type=str, help="The filename of an index file."
     )
-    parser_document.set_defaults(func=main_document)
 
+
+def _build_remove(subparsers):
+    """Add the rm subcommand parser."""
     parser_remove = subparsers.add_parser("rm")
     parser_remove.add_argument(
         "job_id", type=str, nargs="+", help="One or more job ids of jobs to remove."
@@ -1404,8 +1712,18 @@ def main():
         action="store_true",
         help="Be verbose when removing/clearing files.",
     )
-    parser_remove.set_defaults(func=main_remove)
+    parser_remove.add_argument(
+        "--parallel",
+        type=int,
+        nargs="?",
+        const=True,
+        help="Remove jobs in parallel. You may optionally specify how many threads to "
+        "use, otherwise all available processing units will be utilized.",
+    )
+
 
+def _build_move(subparsers):
+    """Add the move subcommand parser."""
     parser_move = subparsers.add_parser("move")
     parser_move.add_argument(
         "project",
@@ -1418,8 +1736,18 @@ def main():
         type=str,
         help="One or more job ids. The corresponding jobs must be initialized.",
     )
-    parser_move.set_defaults(func=main_move)
+    parser_move.add_argument(
+        "--parallel",
+        type=int,
+        nargs="?",
+        const=True,
+        help="Move jobs in parallel. You may optionally specify how many threads to "
+        "use, otherwise all available processing units will be utilized.",
+    )
+
 
+def _build_clone(subparsers):
+    """Add the clone subcommand parser."""
     parser_clone = subparsers.add_parser("clone")
     parser_clone.add_argument(
         "project",
@@ -1432,8 +1760,18 @@ def main():
         type=str,
         help="One or more job ids. The corresponding jobs must be initialized.",
     )
-    parser_clone.set_defaults(func=main_clone)
+    parser_clone.add_argument(
+        "--parallel",
+        type=int,
+        nargs="?",
+        const=True,
+        help="Clone jobs in parallel. You may optionally specify how many threads to "
+        "use, otherwise all available processing units will be utilized.",
+    )
 
+
+def _build_index(subparsers):
+    """Add the index subcommand parser."""
     parser_index = subparsers.add_parser("index")
     parser_index.add_argument(
         "root",
@@ -1444,8 +1782,10 @@ def main():
     parser_index.add_argument(
         "-t", "--tags", nargs="+", help="Specify tags for this main index compilation."
     )
-    parser_index.set_defaults(func=main_index)
 
+
+def _build_find(subparsers):
+    """Add the find subcommand parser."""
     parser_find = subparsers.add_parser(
         "find",
         description="""All filter arguments may be provided either directly in JSON
@@ -1495,7 +1835,8 @@ def main():
         const=3,
         default=3,
         help="Pretty print output when using --sp, --doc, or ---show. "
-        "Argument is the depth to which keys are printed.",
+        "Argument is the depth to which keys are printed. A depth of {} or "
+        "more prints indented JSON.".format(PRETTY_JSON_MIN_DEPTH),
     )
     parser_find.add_argument(
         "-1",
@@ -1503,8 +1844,10 @@ def main():
         action="store_true",
         help="Print output in JSON and on one line.",
     )
-    parser_find.set_defaults(func=main_find)
 
+
+def _build_view(subparsers):
+    """Add the view subcommand parser."""
     parser_view = subparsers.add_parser(
         "view",
         description="""Generate a human readable set of paths representing
@@ -1536,32 +1879,19 @@ def main():
         "on how this is expanded).",
     )
     selection_group = parser_view.add_argument_group("select")
-    selection_group.add_argument(
-        "-f",
-        "--filter",
-        type=str,
-        nargs="+",
-        help="Limit the view to jobs matching this state point filter.",
-    )
-    selection_group.add_argument(
-        "-d",
-        "--doc-filter",
-        type=str,
-        nargs="+",
-        help="Limit the view to jobs matching this document filter.",
-    )
-    selection_group.add_argument(
-        "-j",
-        "--job-id",
-        type=str,
-        nargs="+",
-        help="Limit the view to jobs with these job ids.",
+    _add_selection_args(
+        selection_group,
+        filter_help="Limit the view to jobs matching this state point filter.",
+        doc_filter_help="Limit the view to jobs matching this document filter.",
+        job_id_help="Limit the view to jobs with these job ids.",
     )
     selection_group.add_argument(
         "-i", "--index", type=str, help="The filename of an index file."
     )
-    parser_view.set_defaults(func=main_view)
 
+
+def _build_schema(subparsers):
+    """Add the schema subcommand parser."""
     parser_schema = subparsers.add_parser("schema")
     parser_schema.add_argument(
         "-x",
@@ -1592,29 +1922,16 @@ def main():
         help="The maximum number of entries shown for a value range, defaults to 5.",
     )
     selection_group = parser_schema.add_argument_group("select")
-    selection_group.add_argument(
-        "-f",
-        "--filter",
-        type=str,
-        nargs="+",
-        help="Detect schema only for jobs that match the state point filter.",
-    )
-    selection_group.add_argument(
-        "-d",
-        "--doc-filter",
-        type=str,
-        nargs="+",
-        help="Detect schema only for jobs that match the document filter.",
-    )
-    selection_group.add_argument(
-        "-j",
-        "--job-id",
-        type=str,
-        nargs="+",
-        help="Detect schema only for jobs with the given job ids.",
+    _add_selection_args(
+        selection_group,
+        filter_help="Detect schema only for jobs that match the state point filter.",
+        doc_filter_help="Detect schema only for jobs that match the document filter.",
+        job_id_help="Detect schema only for jobs with the given job ids.",
     )
-    parser_schema.set_defaults(func=main_schema)
 
+
+def _build_shell(subparsers):
+    """Add the shell subcommand parser."""
     parser_shell = subparsers.add_parser("shell")
     parser_shell.add_argument(
         "file", type=str, nargs="?", help="Execute Python script in file."
@@ -1629,29 +1946,16 @@ def main():
         "contains only one job, an additional `job` variable is referencing that "
         "single job, otherwise it is `None`.",
     )
-    selection_group.add_argument(
-        "-f",
-        "--filter",
-        type=str,
-        nargs="+",
-        help="Reduce selection to jobs that match the given filter.",
-    )
-    selection_group.add_argument(
-        "-d",
-        "--doc-filter",
-        type=str,
-        nargs="+",
-        help="Reduce selection to jobs that match the given document filter.",
+    _add_selection_args(
+        selection_group,
+        filter_help="Reduce selection to jobs that match the given filter.",
+        doc_filter_help="Reduce selection to jobs that match the given document filter.",
+        job_id_help="Reduce selection to jobs that match the given job ids.",
     )
-    selection_group.add_argument(
-        "-j",
-        "--job-id",
-        type=str,
-        nargs="+",
-        help="Reduce selection to jobs that match the given job ids.",
-    )
-    parser_shell.set_defaults(func=main_shell)
 
+
+def _build_sync(subparsers):
+    """Add the sync subcommand parser."""
     parser_sync = subparsers.add_parser(
         "sync",
         description="""Use this command to synchronize this project with another project;
@@ -1673,7 +1977,7 @@ job documents."
         help="Optional: The root directory of the project that should be modified for "
         "synchronization, defaults to the local project.",
     )
-    add_verbosity_argument(parser_sync, default=2)
+    add_verbosity_argument(parser_sync, default=2, max_level=len(LOG_LEVELS) - 1)
 
     sync_group = parser_sync.add_argument_group("copy options")
     sync_group.add_argument(
@@ -1816,29 +2120,16 @@ job documents."
     )
 
     selection_group = parser_sync.add_argument_group("select")
-    selection_group.add_argument(
-        "-f",
-        "--filter",
-        type=str,
-        nargs="+",
-        help="Only synchronize jobs that match the state point filter.",
+    _add_selection_args(
+        selection_group,
+        filter_help="Only synchronize jobs that match the state point filter.",
+        doc_filter_help="Only synchronize jobs that match the document filter.",
+        job_id_help="Only synchronize jobs with the given job ids.",
     )
-    selection_group.add_argument(
-        "-d",
-        "--doc-filter",
-        type=str,
-        nargs="+",
-        help="Only synchronize jobs that match the document filter.",
-    )
-    selection_group.add_argument(
-        "-j",
-        "--job-id",
-        type=str,
-        nargs="+",
-        help="Only synchronize jobs with the given job ids.",
-    )
-    parser_sync.set_defaults(func=main_sync)
 
+
+def _build_import(subparsers):
+    """Add the import subcommand parser."""
     parser_import = subparsers.add_parser(
         "import",
         description="""Import an existing dataset into this project. Optionally provide a file path
@@ -1875,8 +2166,10 @@ job documents."
         action="store_true",
         help="Synchronize the project with the origin data space interactively.",
     )
-    parser_import.set_defaults(func=main_import)
 
+
+def _build_export(subparsers):
+    """Add the export subcommand parser."""
     parser_export = subparsers.add_parser(
         "export",
         description="""Export the project data space (or a subset) to a directory, a zipfile,
@@ -1899,36 +2192,25 @@ job documents."
         "to a directory target.",
     )
     selection_group = parser_export.add_argument_group("select")
-    selection_group.add_argument(
-        "-f",
-        "--filter",
-        type=str,
-        nargs="+",
-        help="Limit the jobs to export to those matching the state point filter.",
-    )
-    selection_group.add_argument(
-        "-d",
-        "--doc-filter",
-        type=str,
-        nargs="+",
-        help="Limit the jobs to export to those matching this document filter.",
-    )
-    selection_group.add_argument(
-        "-j",
-        "--job-id",
-        type=str,
-        nargs="+",
-        help="Limit the jobs to export to those matching the provided job ids.",
+    _add_selection_args(
+        selection_group,
+        filter_help="Limit the jobs to export to those matching the state point filter.",
+        doc_filter_help="Limit the jobs to export to those matching this document filter.",
+        job_id_help="Limit the jobs to export to those matching the provided job ids.",
     )
-    parser_export.set_defaults(func=main_export)
 
-    parser_update_cache = subparsers.add_parser(
+
+def _build_update_cache(subparsers):
+    """Add the update-cache subcommand parser."""
+    subparsers.add_parser(
         "update-cache",
         description="""Use this command to update the project's persistent state point cache.
 This feature is still experimental and may be removed in future versions.""",
     )
-    parser_update_cache.set_defaults(func=main_update_cache)
 
+
+def _build_config(subparsers):
+    """Add the config subcommand parser."""
     parser_config = subparsers.add_parser("config")
     parser_config.add_argument(
         "-g",
@@ -1946,7 +2228,7 @@ This feature is still experimental and may be removed in future versions.""",
         action="store_true",
         help="Skip sanity checks when modifying the configuration.",
     )
-    config_subparsers = parser_config.add_subparsers()
+    config_subparsers = parser_config.add_subparsers(dest="config_subcommand")
 
     parser_show = config_subparsers.add_parser("show")
     parser_show.add_argument(
@@ -1955,7 +2237,6 @@ This feature is still experimental and may be removed in future versions.""",
         nargs="*",
         help="The key(s) to show, omit to show the full configuration.",
     )
-    parser_show.set_defaults(func=main_config_show)
 
     parser_set = config_subparsers.add_parser("set")
     parser_set.add_argument("key", type=str, help="The key to modify.")
@@ -1965,8 +2246,8 @@ This feature is still experimental and may be removed in future versions.""",
     parser_set.add_argument(
         "-f", "--force", action="store_true", help="Override any validation warnings."
     )
-    parser_set.set_defaults(func=main_config_set)
 
+    pw_encryption_schemes, default_pw_encryption_scheme = _get_pw_encryption_schemes()
     parser_host = config_subparsers.add_parser("host")
     parser_host.add_argument(
         "hostname",
@@ -1995,13 +2276,13 @@ This feature is still experimental and may be removed in future versions.""",
         type=str,
         nargs="?",
         const=True,
-        choices=PW_ENCRYPTION_SCHEMES,
+        choices=pw_encryption_schemes,
         help="Update the password of the specified resource. "
         "Use in combination with -p/--password to store the "
         "new password. You can optionally specify the hashing "
         "algorithm used for the password encryption. Anything "
         "else but 'None' requires passlib! (default={})".format(
-            DEFAULT_PW_ENCRYPTION_SCHEME
+            default_pw_encryption_scheme
         ),
     )
     parser_host.add_argument(
@@ -2015,17 +2296,153 @@ This feature is still experimental and may be removed in future versions.""",
     parser_host.add_argument(
         "--test", action="store_true", help="Attempt connecting to the specified host."
     )
-    parser_host.set_defaults(func=main_config_host)
 
-    parser_verify = config_subparsers.add_parser("verify")
-    parser_verify.set_defaults(func=main_config_verify)
+    config_subparsers.add_parser("verify")
+
+
+# UNCOMMENT THE FOLLOWING BLOCK WHEN THE FIRST MIGRATION IS INTRODUCED.
+# def _build_migrate(subparsers):
+#     """Add the migrate subcommand parser."""
+#     parser_migrate = subparsers.add_parser(
+#         'migrate',
+#         description="Irreversibly migrate this project's schema version to the "
+#                     "supported version.")
+
+
+# Functions adding the parser of each subcommand, keyed by subcommand name.
+SUBPARSER_BUILDERS = {
+    "init": _build_init,
+    "project": _build_project,
+    "job": _build_job,
+    "statepoint": _build_statepoint,
+    "diff": _build_diff,
+    "document": _build_document,
+    "rm": _build_remove,
+    "move": _build_move,
+    "clone": _build_clone,
+    "index": _build_index,
+    "find": _build_find,
+    "view": _build_view,
+    "schema": _build_schema,
+    "shell": _build_shell,
+    "sync": _build_sync,
+    "import": _build_import,
+    "export": _build_export,
+    "update-cache": _build_update_cache,
+    "config": _build_config,
+    # UNCOMMENT THE FOLLOWING LINE WHEN THE FIRST MIGRATION IS INTRODUCED.
+    # "migrate": _build_migrate,
+}
+
+
+# The handlers of the config subcommand are keyed by its own subcommand.
+SUBCOMMAND_HANDLERS = {
+    "init": main_init,
+    "project": main_project,
+    "job": main_job,
+    "statepoint": main_statepoint,
+    "diff": main_diff,
+    "document": main_document,
+    "rm": main_remove,
+    "move": main_move,
+    "clone": main_clone,
+    "index": main_index,
+    "find": main_find,
+    "view": main_view,
+    "schema": main_schema,
+    "shell": main_shell,
+    "sync": main_sync,
+    "import": main_import,
+    "export": main_export,
+    "update-cache": main_update_cache,
+    "config": {
+        "show": main_config_show,
+        "set": main_config_set,
+        "host": main_config_host,
+        "verify": main_config_verify,
+    },
+    # UNCOMMENT THE FOLLOWING LINE WHEN THE FIRST MIGRATION IS INTRODUCED.
+    # "migrate": main_migrate,
+}
+
+
+def _find_subcommand(argv):
+    """Return the name of the subcommand in argv or None if there is none.
+
+    None of the top-level options take a value, so the subcommand is the
+    first argument that is not an option, e.g., ``signac -v --debug find``.
+    If the top-level help is requested, e.g., ``signac -h find``, None is
+    returned, since the help lists all subcommands.
+    """
+    for arg in argv:
+        if arg in ("-h", "--help"):
+            return None
+        if not arg.startswith("-"):
+            return arg
+    return None
+
+
+@contextlib.contextmanager
+def _untranslated_argparse():
+    """Disable the translation of argparse messages within this context.
+
+    signac does not ship translations, but argparse looks up a translation
+    for each of its messages, which dominates the parser construction time.
+    """
+    gettext = argparse._
+    argparse._ = str
+    try:
+        yield
+    finally:
+        argparse._ = gettext
+
+
+def _build_main_parser():
+    """Build the top-level parser and return it with its subparsers action."""
+    parser = argparse.ArgumentParser(
+        description="signac aids in the management, access and analysis of "
+        "large-scale computational investigations."
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Show traceback on error for debugging."
+    )
+    parser.add_argument(
+        "--version", action="store_true", help="Display the version number and exit."
+    )
+    add_verbosity_argument(parser, default=2, max_level=len(LOG_LEVELS) - 1)
+    parser.add_argument(
+        "-y",
+        "--yes",
+        action="store_true",
+        help="Answer all questions with yes. Useful for scripted interaction.",
+    )
+    subparsers = parser.add_subparsers(dest="subcommand")
+    return parser, subparsers
+
+
+@functools.lru_cache(maxsize=None)
+def _get_parser(subcommand=None):
+    """Return the command line parser.
+
+    Only the parser of the given subcommand is built. All parsers are built
+    if the subcommand is None, e.g., for the top-level help. The parsers are
+    cached for repeated calls of :func:`main` within the same process.
+    """
+    with _untranslated_argparse():
+        parser, subparsers = _build_main_parser()
+        if subcommand is None:
+            for build_subparser in SUBPARSER_BUILDERS.values():
+                build_subparser(subparsers)
+        else:
+            SUBPARSER_BUILDERS[subcommand](subparsers)
+    return parser
+
 
-    # UNCOMMENT THE FOLLOWING BLOCK WHEN THE FIRST MIGRATION IS INTRODUCED.
-    # parser_migrate = subparsers.add_parser(
-    #     'migrate',
-    #     description="Irreversibly migrate this project's schema version to the "
-    #                 "supported version.")
-    # parser_migrate.set_defaults(func=main_migrate)
+def main():
+    """Provide command line interface."""
+    # Projects are only cached within a single invocation, because the
+    # configuration may change between calls of main() within one process.
+    _get_project_at.cache_clear()
 
     # This is a hack, as argparse itself does not
     # allow to parse only --version without any
@@ -2034,47 +2451,43 @@ This feature is still experimental and may be removed in future versions.""",
         print("signac", __version__)
         sys.exit(0)
 
+    # Without any arguments only the usage is shown, which merely lists the
+    # names of the subcommands.
+    if len(sys.argv) < 2:
+        with _untranslated_argparse():
+            parser, subparsers = _build_main_parser()
+            for subcommand in SUBPARSER_BUILDERS:
+                subparsers.add_parser(subcommand)
+            parser.print_usage()
+        sys.exit(2)
+
+    subcommand = _find_subcommand(sys.argv[1:])
+    parser = _get_parser(subcommand if subcommand in SUBPARSER_BUILDERS else None)
     args = parser.parse_args()
     if args.debug:
         logging.basicConfig(level=logging.DEBUG)
     else:
-        log_level = (
-            logging.DEBUG
-            if args.debug
-            else [
-                logging.CRITICAL,
-                logging.ERROR,
-                logging.WARNING,
-                logging.INFO,
-                logging.MORE,
-                logging.DEBUG,
-            ][min(args.verbosity, 5)]
-        )
-        logging.basicConfig(level=log_level)
+        logging.basicConfig(level=LOG_LEVELS[args.verbosity])
 
-    if not hasattr(args, "func"):
+    handler = SUBCOMMAND_HANDLERS.get(args.subcommand)
+    if isinstance(handler, dict):
+        handler = handler.get(args.config_subcommand)
+    if handler is None:
         parser.print_usage()
         sys.exit(2)
     try:
-        args.func(args)
-    except KeyboardInterrupt:
-        _print_err()
-        _print_err("Interrupted.")
-        if args.debug:
-            raise
-        sys.exit(1)
-    except RuntimeWarning as warning:
-        _print_err(f"Warning: {warning}")
-        if args.debug:
+        handler(args)
+    except BaseException as error:
+        for error_type in type(error).__mro__:
+            if error_type in ERROR_MESSAGES:
+                break
+        else:  # e.g., SystemExit
             raise
-        sys.exit(1)
-    except Exception as error:
-        _print_err(f"Error: {error}")
+        _print_err(ERROR_MESSAGES[error_type].format(error))
         if args.debug:
             raise
         sys.exit(1)
-    else:
-        sys.exit(0)
+    sys.exit(0)
 
 
 if __name__ == "__main__":
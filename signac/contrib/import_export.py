@@ -17,6 +17,7 @@ from string import Formatter
 from tempfile import TemporaryDirectory
 from zipfile import ZIP_DEFLATED, ZipFile
 
+from ..syncutil import _copy2
 from .errors import DestinationExistsError, StatepointParsingError
 from .utility import _dotted_dict_to_nested_dicts, _mkdir_p
 
@@ -739,6 +740,25 @@ def _crawl_directory_data_space(root, project, schema_function):
             yield path, job
 
 
+def _copytree(src, dst):
+    """Copy a directory tree, using in-kernel copies or reflinks where available.
+
+    Parameters
+    ----------
+    src : str
+        Source directory.
+    dst : str
+        Destination directory, which must not exist.
+
+    Returns
+    -------
+    str
+        Destination directory.
+
+    """
+    return shutil.copytree(src, dst, copy_function=_copy2)
+
+
 def _copy_to_job_workspace(src, job, copytree):
     """Copy the source to job's workspace.
 
@@ -788,7 +808,7 @@ class _CopyFromDirectoryExecutor:
 
     def __call__(self, copytree=None):
         if copytree is None:
-            copytree = shutil.copytree
+            copytree = _copytree
         return _copy_to_job_workspace(self.src, self.job, copytree)
 
 
@@ -877,8 +897,8 @@ class _CopyFromZipFileExecutor:
         for name in self.names:
             fn_dst = self.job.fn(os.path.relpath(name, self.root))
             _mkdir_p(os.path.dirname(fn_dst))
-            with open(fn_dst, "wb") as dst:
-                dst.write(self.zipfile.read(name))
+            with self.zipfile.open(name) as src, open(fn_dst, "wb") as dst:
+                shutil.copyfileobj(src, dst)
         return self.job.workspace()
 
     def __str__(self):
@@ -1000,7 +1020,7 @@ class _CopyFromTarFileExecutor:
     def __call__(self, copytree=None):
         assert copytree is None
         assert os.path.isdir(self.src)
-        return _copy_to_job_workspace(self.src, self.job, shutil.copytree)
+        return _copy_to_job_workspace(self.src, self.job, _copytree)
 
 
 def _tarfile_path_join(path, fn):
@@ -1227,7 +1247,7 @@ def import_into_project(origin, project, schema=None, copytree=None):
 
     with _prepare_import_into_project(origin, project, schema) as data_mapping:
         if copytree is None and os.path.isdir(origin):
-            copytree = shutil.copytree
+            copytree = _copytree
 
         for src, copy in data_mapping:
             yield src, copy(copytree)
@@ -322,13 +322,19 @@ class Job:
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return NotImplemented
-        return self.id == other.id and os.path.realpath(
-            self.workspace()
-        ) == os.path.realpath(other.workspace())
+        if self is other:
+            return True
+        if self.id != other.id:
+            return False
+        # Only resolve the paths if the workspaces are not trivially identical.
+        workspace, other_workspace = self.workspace(), other.workspace()
+        return workspace == other_workspace or os.path.realpath(
+            workspace
+        ) == os.path.realpath(other_workspace)
 
     def __str__(self):
         """Return the job's id."""
-        return str(self.id)
+        return self._id
 
     def __repr__(self):
         return "{}(project={}, statepoint={})".format(
@@ -530,7 +536,7 @@ class Job:
         with self._lock:
             if self._document is None:
                 self.init()
-                fn_doc = os.path.join(self.workspace(), self.FN_DOCUMENT)
+                fn_doc = os.sep.join((self.workspace(), self.FN_DOCUMENT))
                 self._document = BufferedJSONAttrDict(
                     filename=fn_doc, write_concern=True
                 )
@@ -720,14 +726,15 @@ class Job:
 
         """
         try:
-            for fn in os.listdir(self.workspace()):
-                if fn in (self.FN_MANIFEST, self.FN_DOCUMENT):
+            with os.scandir(self.workspace()) as it:
+                entries = list(it)
+            for entry in entries:
+                if entry.name in (self.FN_MANIFEST, self.FN_DOCUMENT):
                     continue
-                path = os.path.join(self.workspace(), fn)
-                if os.path.isfile(path):
-                    os.remove(path)
-                elif os.path.isdir(path):
-                    shutil.rmtree(path)
+                if entry.is_file():
+                    os.remove(entry.path)
+                elif entry.is_dir():
+                    shutil.rmtree(entry.path)
             self.document.clear()
         except OSError as error:
             if error.errno != errno.ENOENT:
@@ -41,7 +41,7 @@ from .filterparse import _add_prefix, _root_keys, parse_filter
 from .hashing import calc_id
 from .indexing import MainCrawler, SignacProjectCrawler
 from .job import Job
-from .schema import ProjectSchema
+from .schema import ProjectSchema, _build_job_statepoint_index
 from .utility import _mkdir_p, _nested_dicts_to_dotted_keys, split_and_print_progress
 
 logger = logging.getLogger(__name__)
@@ -872,8 +872,6 @@ class Project:
             corresponding job ids (Default value = None).
 
         """
-        from .schema import _build_job_statepoint_index
-
         if index is None:
             index = [{"_id": job.id, "sp": job.sp()} for job in self]
         for x, y in _build_job_statepoint_index(
@@ -903,8 +901,6 @@ class Project:
             The detected project schema.
 
         """
-        from .schema import _build_job_statepoint_index
-
         if index is None:
             index = self.index(include_job_document=False)
         if subset is not None:
@@ -2734,7 +2730,7 @@ class JobsCursor:
         elif key is None:
             # Must return a type that can be ordered with <, >
             def keyfunction(job):
-                return str(job)
+                return job.id
 
         else:
             # Pass the job document to a callable
@@ -2820,7 +2816,7 @@ class JobsCursor:
         elif key is None:
             # Must return a type that can be ordered with <, >
             def keyfunction(job):
-                return str(job)
+                return job.id
 
         else:
             # Pass the job document to a callable
@@ -89,7 +89,25 @@ def prompt_password(prompt="Password: "):
     return getpass.getpass(prompt)
 
 
-def add_verbosity_argument(parser, default=0):
+class _BoundedCountAction(argparse.Action):
+    """Count the number of occurrences of an option up to a maximum."""
+
+    def __init__(self, option_strings, dest, maximum, default=None, help=None):
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            nargs=0,
+            default=default,
+            help=help,
+        )
+        self.maximum = maximum
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        count = getattr(namespace, self.dest, None) or 0
+        setattr(namespace, self.dest, min(count + 1, self.maximum))
+
+
+def add_verbosity_argument(parser, default=0, max_level=None):
     """Add a verbosity argument to parser.
 
     Parameters
@@ -98,6 +116,8 @@ def add_verbosity_argument(parser, default=0):
         The parser to which to add a verbosity argument.
     default : int
         The default level, defaults to 0.
+    max_level : int
+        The maximum level, unbounded if None (Default value = None).
 
     Notes
     -----
@@ -106,13 +126,23 @@ def add_verbosity_argument(parser, default=0):
     increase the level of verbosity.
 
     """
-    parser.add_argument(
-        "-v",
-        "--verbosity",
-        help="Set level of verbosity.",
-        action="count",
-        default=default,
-    )
+    if max_level is None:
+        parser.add_argument(
+            "-v",
+            "--verbosity",
+            help="Set level of verbosity.",
+            action="count",
+            default=default,
+        )
+    else:
+        parser.add_argument(
+            "-v",
+            "--verbosity",
+            help="Set level of verbosity.",
+            action=_BoundedCountAction,
+            maximum=max_level,
+            default=default,
+        )
 
 
 @deprecated(
@@ -87,7 +87,7 @@ from .errors import (
     FileSyncConflict,
     SchemaSyncConflict,
 )
-from .syncutil import _FileModifyProxy, dircmp, dircmp_deep, logger
+from .syncutil import _diff_dirs, _FileModifyProxy, logger
 
 __all__ = [
     "FileSync",
@@ -158,20 +158,14 @@ class DocSync:
     @staticmethod
     def update(src, dst):
         """Perform a simple update."""
-        for key in src.keys():
-            dst[key] = src[key]
+        dst.update(src)
 
     class ByKey:
         """Synchronize documents key by key."""
 
         def __init__(self, key_strategy=None):
             if isinstance(key_strategy, str):
-
-                def regex_key_strategy(key):
-                    """Match keys according to key_strategy."""
-                    return re.match(key_strategy, key)
-
-                self.key_strategy = regex_key_strategy
+                self.key_strategy = re.compile(key_strategy).match
             else:
                 self.key_strategy = key_strategy
             self.skipped_keys = set()
@@ -181,14 +175,15 @@ class DocSync:
 
         def __call__(self, src, dst, root=""):
             """Synchronize src and dst."""
-            if src == dst:
+            if src is dst or src == dst:
                 return
             for key, value in src.items():
                 if key in dst:
-                    if dst[key] == value:
+                    dst_value = dst[key]
+                    if dst_value is value or dst_value == value:
                         continue
                     elif isinstance(value, Mapping):
-                        self(src[key], dst[key], key + ".")
+                        self(value, dst_value, key + ".")
                         continue
                     elif self.key_strategy is None or not self.key_strategy(root + key):
                         self.skipped_keys.add(root + key)
@@ -204,41 +199,55 @@ class DocSync:
                     logger.more("Skipped keys: {}".format(", ".join(self.skipped_keys)))
 
 
+# Group references may change their meaning when patterns are joined.
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def _compile_exclude(patterns):
+    """Return a function that matches file names against any of the patterns.
+
+    Returns None if there are no patterns.
+    """
+    if not patterns:
+        return None
+    if not any(_BACKREFERENCE.search(pattern) for pattern in patterns):
+        try:
+            return re.compile("|".join(f"(?:{pattern})" for pattern in patterns)).match
+        except re.error:  # e.g., patterns with global inline flags
+            pass
+    compiled = [re.compile(pattern) for pattern in patterns]
+    return lambda fn: any(pattern.match(fn) for pattern in compiled)
+
+
 def _sync_job_workspaces(
     src, dst, strategy, exclude, copy, copytree, recursive=True, deep=False, subdir=""
 ):
     """Synchronize two job workspaces file by file, following the provided strategy."""
-    if deep:
-        diff = dircmp_deep(src.fn(subdir), dst.fn(subdir))
-    else:
-        diff = dircmp(src.fn(subdir), dst.fn(subdir))
-
-    for fn in diff.left_only:
-        if exclude and any([re.match(p, fn) for p in exclude]):
-            logger.debug(f"File named '{fn}' is skipped (excluded).")
-            continue
-        fn_src = os.path.join(src.workspace(), subdir, fn)
-        fn_dst = os.path.join(dst.workspace(), subdir, fn)
-        if os.path.isfile(fn_src):
+    src_dir = os.path.join(src.workspace(), subdir)
+    dst_dir = os.path.join(dst.workspace(), subdir)
+    diff = _diff_dirs(src_dir, dst_dir, deep=deep, exclude=exclude)
+
+    for entry in diff.left_only:
+        fn = entry.name
+        fn_src = entry.path
+        fn_dst = os.path.join(dst_dir, fn)
+        if entry.is_file():
             copy(fn_src, fn_dst)
         elif recursive:
             copytree(fn_src, fn_dst)
         else:
             logger.warning(f"Skip directory '{fn_src}'.")
     for fn in diff.diff_files:
-        if exclude and any([re.match(p, fn) for p in exclude]):
-            logger.debug(f"File named '{fn}' is skipped (excluded).")
-            continue
         if strategy is None:
             raise FileSyncConflict(fn)
         else:
-            fn_src = os.path.join(src.workspace(), subdir, fn)
-            fn_dst = os.path.join(dst.workspace(), subdir, fn)
+            fn_src = os.path.join(src_dir, fn)
+            fn_dst = os.path.join(dst_dir, fn)
             if strategy(src, dst, os.path.join(subdir, fn)):
                 copy(fn_src, fn_dst)
             else:
                 logger.debug(f"Skip file '{fn}'.")
-    for _subdir in diff.subdirs:
+    for _subdir in diff.common_dirs:
         if recursive:
             _sync_job_workspaces(
                 src=src,
@@ -255,9 +264,32 @@ def _sync_job_workspaces(
             logger.warning("Skip directory '{}'.".format(os.path.join(subdir, _subdir)))
 
 
+def _transfer_files(transfers, parallel, pool=None):
+    """Perform file transfers, given as (function, src, dst) tuples, with a pool of threads.
+
+    The transfers are scheduled on the given pool, otherwise a new pool with
+    the requested number of threads is created.
+    """
+    if pool is None:
+        with ThreadPool(None if parallel is True else parallel) as pool:
+            for _ in pool.imap_unordered(lambda t: t[0](t[1], t[2]), transfers):
+                pass
+    else:
+        results = [pool.apply_async(func, (src, dst)) for func, src, dst in transfers]
+        # All transfers are completed before an error is raised, so that no
+        # files are still being copied once the job's synchronization failed.
+        for result in results:
+            result.wait()
+        for result in results:
+            result.get()
+
+
 def _identical_path(a, b):
-    """Verify if two absolute real paths match."""
-    return os.path.abspath(os.path.realpath(a)) == os.path.abspath(os.path.realpath(b))
+    """Verify if two paths refer to the same file or directory."""
+    try:
+        return os.path.samefile(a, b)
+    except OSError:  # at least one of the paths does not exist
+        return os.path.realpath(a) == os.path.realpath(b)
 
 
 def sync_jobs(
@@ -274,6 +306,7 @@ def sync_jobs(
     preserve_group=False,
     deep=False,
     dry_run=False,
+    parallel=False,
 ):
     """Synchronize the dst job with the src job.
 
@@ -330,8 +363,15 @@ def sync_jobs(
     dry_run : bool
         If True, do not actually perform any synchronization operations.
         (Default value = False)
-    deep : bool
+    deep : bool or str
+        If True, compare the contents of all files present in both workspaces.
+        If False, only compare the contents of files whose size and modification
+        time differ. If 'stat', consider all files with differing size or
+        modification time as different without comparing their contents.
         (Default value = False)
+    parallel : bool or int
+        Copy files with a pool of threads, using the given number of threads
+        or as many as there are CPUs if True. (Default value = False)
 
     """
     # Check identity
@@ -350,12 +390,13 @@ def sync_jobs(
     if doc_sync is None:
         doc_sync = DocSync.ByKey()
 
-    # the exclude argument must be a list
+    # the exclude argument must be a list, which is copied, since it is
+    # extended below and may be shared between several jobs
     if exclude is None:
         exclude = []
     elif not isinstance(exclude, list):
         exclude = [exclude]
-    exclude.append(src.FN_MANIFEST)
+    exclude = exclude + [src.FN_MANIFEST]
     if doc_sync != DocSync.COPY:
         exclude.append(src.FN_DOCUMENT)
 
@@ -376,19 +417,35 @@ def sync_jobs(
     else:
         logger.debug(f"Synchronizing job '{src}'...")
 
+    # The pool for file transfers shared by all jobs of a project synchronization.
+    pool = proxy.pool
     if os.path.isdir(src.workspace()):
         if not dry_run:
             dst.init()
+        if parallel or pool is not None:
+            # All conflicts are resolved before any of the files are copied.
+            transfers = []
+
+            def copy(fn_src, fn_dst):
+                transfers.append((proxy.copy, fn_src, fn_dst))
+
+            def copytree(fn_src, fn_dst):
+                transfers.append((proxy.copytree, fn_src, fn_dst))
+
+        else:
+            copy, copytree = proxy.copy, proxy.copytree
         _sync_job_workspaces(
             src=src,
             dst=dst,
             strategy=strategy,
-            exclude=exclude,
-            copy=proxy.copy,
-            copytree=proxy.copytree,
+            exclude=_compile_exclude(exclude),
+            copy=copy,
+            copytree=copytree,
             recursive=recursive,
             deep=deep,
         )
+        if parallel or pool is not None:
+            _transfer_files(transfers, parallel, pool)
 
     if not (doc_sync is DocSync.NO_SYNC or doc_sync == DocSync.COPY):
         if src.document != dst.document:
@@ -469,9 +526,15 @@ def sync_projects(
         If True, do not actually perform the synchronization operation, just
         log what would happen theoretically. Useful to test synchronization
         strategies without the risk of data loss. (Default value = False)
-    deep : bool
+    deep : bool or str
+        If True, compare the contents of all files present in both workspaces.
+        If False, only compare the contents of files whose size and modification
+        time differ. If 'stat', consider all files with differing size or
+        modification time as different without comparing their contents.
         (Default value = False)
-    parallel : bool
+    parallel : bool or int
+        Synchronize jobs and copy their files with pools of threads, using the
+        given number of threads or as many as there are CPUs if True.
         (Default value = False)
     collect_stats : bool
         (Default value = False)
@@ -577,6 +640,7 @@ def sync_projects(
                 exclude=exclude,
                 doc_sync=doc_sync,
                 recursive=recursive,
+                deep=deep,
                 dry_run=proxy,  # used as internal argument to forward the proxy
             )
             logger.more(f"Synchronized job '{src_job}'.")
@@ -589,10 +653,27 @@ def sync_projects(
                 "multiple" if num_processes is None else num_processes
             )
         )
-        with ThreadPool(None if parallel is True else parallel) as pool:
-            for i, ret in enumerate(pool.imap(_clone_or_sync, jobs_to_sync)):
-                count[ret] += 1
-                logger.info("Project sync progress: {}/{}".format(i + 1, N))
+        # Hand out jobs in batches, about four batches per thread, to reduce
+        # the scheduling overhead for projects with many small jobs.
+        num_threads = num_processes or os.cpu_count() or 1
+        chunksize = max(1, N // (4 * num_threads))
+        # The file transfers of all synchronized jobs are performed by one
+        # shared pool. Each job task waits for its own transfers before its
+        # document is synchronized, hence this must not be the job pool.
+        transfer_pool = ThreadPool(num_processes)
+        proxy.pool = transfer_pool
+        try:
+            with ThreadPool(num_processes) as pool:
+                for i, ret in enumerate(
+                    pool.imap(_clone_or_sync, jobs_to_sync, chunksize=chunksize)
+                ):
+                    count[ret] += 1
+                    logger.info("Project sync progress: {}/{}".format(i + 1, N))
+        finally:
+            proxy.pool = None
+            # Transfers that were already scheduled are completed.
+            transfer_pool.close()
+            transfer_pool.join()
     else:
         for i, src_job in enumerate(jobs_to_sync):
             count[_clone_or_sync(src_job)] += 1
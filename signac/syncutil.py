@@ -3,10 +3,17 @@
 # This software is licensed under the BSD 3-Clause License.
 """Utilities for synchronization."""
 
+import errno
 import filecmp
 import logging
+import mmap
 import os
 import shutil
+import stat
+import sys
+import threading
+from collections import namedtuple
+from collections.abc import Mapping
 from contextlib import contextmanager
 from copy import deepcopy
 from filecmp import dircmp
@@ -15,6 +22,11 @@ from deprecation import deprecated
 
 from .version import __version__
 
+if sys.platform.startswith("linux"):
+    import fcntl
+else:  # the fast copy paths below are specific to Linux
+    fcntl = None  # type: ignore
+
 LEVEL_MORE = logging.INFO - 5
 
 logger = logging.getLogger("sync")
@@ -29,6 +41,20 @@ def log_more(msg, *args, **kwargs):
 
 logger.more = log_more  # type: ignore
 
+# Deep comparisons of files of at least this size use memory maps.
+_MMAP_COMPARE_MIN_SIZE = 1 << 20
+_MMAP_COMPARE_CHUNK_SIZE = 1 << 23
+
+# Linux ioctl request to share the data blocks of one file with another.
+_FICLONE = 0x40049409
+_REFLINK_UNSUPPORTED_ERRNOS = frozenset(
+    (errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS)
+)
+_REFLINK_UNSUPPORTED_DEVICES = set()
+
+# Marks keys that did not exist before a modification recorded by _DocProxy.
+_MISSING = object()
+
 
 @deprecated(
     deprecated_in="1.6.0",
@@ -77,13 +103,202 @@ def copytree(src, dst, copy_function=shutil.copy2, symlinks=False):
         raise shutil.Error(errors)
 
 
+def _reflink(fsrc, fdst):
+    """Try to clone the data blocks of fsrc into fdst.
+
+    Returns True on success and False if the filesystem does not support
+    reflinks, in which case the decision is cached per device.
+    """
+    device = os.fstat(fsrc.fileno()).st_dev
+    if device in _REFLINK_UNSUPPORTED_DEVICES:
+        return False
+    try:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    except OSError as error:
+        if error.errno not in _REFLINK_UNSUPPORTED_ERRNOS:
+            raise
+        if error.errno != errno.EXDEV:
+            _REFLINK_UNSUPPORTED_DEVICES.add(device)
+        return False
+    return True
+
+
+def _copy_file_range(fsrc, fdst):
+    """Copy all data of fsrc to fdst within the kernel.
+
+    Returns False if the data could not be copied this way, in which case the
+    file positions must be reset before copying the data otherwise.
+    """
+    offset = 0
+    try:
+        while True:
+            copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30)
+            if not copied:
+                break
+            offset += copied
+    except (AttributeError, OSError):  # e.g., not supported by filesystem
+        return False
+    # Like the fast-copy functions of shutil, give up if nothing was copied
+    # from a non-empty file, which some filesystems report instead of an error.
+    return offset > 0 or os.fstat(fsrc.fileno()).st_size == 0
+
+
+def _copyfile(src, dst):
+    """Copy the contents of the file src to the file dst.
+
+    On Linux, files on copy-on-write filesystems (e.g. Btrfs or XFS) are cloned
+    with the ``FICLONE`` ioctl. Otherwise, where available, the data is copied
+    within the kernel with :func:`os.copy_file_range`. On all other platforms,
+    this function is equivalent to :func:`shutil.copyfile`.
+    """
+    if fcntl is None:
+        shutil.copyfile(src, dst)
+        return
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        if _reflink(fsrc, fdst):
+            return
+        if not _copy_file_range(fsrc, fdst):
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst)
+
+
+def _copy2(src, dst):
+    """Copy the file src to the file dst with its metadata, see :func:`shutil.copy2`."""
+    _copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+def _cmp_mmap(a, b):
+    """Compare the contents of two files of equal size through memory maps."""
+    with open(a, "rb") as file_a, open(b, "rb") as file_b:
+        with mmap.mmap(file_a.fileno(), 0, access=mmap.ACCESS_READ) as mm_a:
+            with mmap.mmap(file_b.fileno(), 0, access=mmap.ACCESS_READ) as mm_b:
+                for start in range(0, len(mm_a), _MMAP_COMPARE_CHUNK_SIZE):
+                    end = start + _MMAP_COMPARE_CHUNK_SIZE
+                    if mm_a[start:end] != mm_b[start:end]:
+                        return False
+    return True
+
+
+def _signature(st):
+    return stat.S_IFMT(st.st_mode), st.st_size, st.st_mtime
+
+
+def _cmp_stat(a, b, stat_a, stat_b):
+    """Compare two files only by type, size, and modification time."""
+    return _signature(stat_a) == _signature(stat_b)
+
+
+def _cmp_shallow(a, b, stat_a, stat_b):
+    """Compare two files by type, size, and modification time or by contents."""
+    if _signature(stat_a) == _signature(stat_b):
+        return True
+    return _cmp_deep(a, b, stat_a, stat_b)
+
+
+def _cmp_deep(a, b, stat_a, stat_b):
+    """Compare the contents of two files."""
+    if stat_a.st_size != stat_b.st_size:
+        return False
+    if stat_a.st_size >= _MMAP_COMPARE_MIN_SIZE:
+        return _cmp_mmap(a, b)
+    return filecmp.cmp(a, b, shallow=False)
+
+
+def _get_file_comparator(deep):
+    """Return the file comparison function for the given deep argument."""
+    if deep == "stat":
+        return _cmp_stat
+    return _cmp_deep if deep else _cmp_shallow
+
+
+# Like filecmp.dircmp, ignore version control and cache directories by default.
+_DIRCMP_IGNORE = frozenset(
+    getattr(filecmp, "DEFAULT_IGNORES", ["RCS", "CVS", "tags"])  # Python < 3.8
+)
+
+_DirDiff = namedtuple("_DirDiff", ["left_only", "diff_files", "common_dirs"])
+
+
+def _diff_dirs(left, right, deep=False, ignore=_DIRCMP_IGNORE, exclude=None):
+    """Compare the entries of two directories.
+
+    Unlike :class:`filecmp.dircmp`, the directories are scanned with
+    :func:`os.scandir`, so that the type of most entries is known without an
+    additional system call and the stat results are obtained at most once.
+
+    Parameters
+    ----------
+    left : str
+        Path of the left directory.
+    right : str
+        Path of the right directory.
+    deep : bool or str
+        See :func:`~signac.sync.sync_jobs` (Default value = False).
+    ignore : set
+        Names of entries that are ignored.
+    exclude : callable
+        Entries only found on the left and common files are skipped without
+        comparison if this function returns True for their name
+        (Default value = None).
+
+    Returns
+    -------
+    :class:`_DirDiff`
+        The entries only found on the left as :class:`os.DirEntry` objects
+        and the names of differing files and of common sub-directories,
+        each sorted by name. Entries whose type differs, or that cannot be
+        accessed, are omitted like :attr:`filecmp.dircmp.common_funny`.
+
+    """
+    compare = _get_file_comparator(deep)
+    with os.scandir(right) as entries:
+        right_entries = {entry.name: entry for entry in entries}
+    with os.scandir(left) as entries:
+        left_entries = sorted(entries, key=lambda entry: entry.name)
+    left_only, diff_files, common_dirs = [], [], []
+    for entry in left_entries:
+        if entry.name in ignore:
+            continue
+        other = right_entries.get(entry.name)
+        if other is not None and entry.is_dir() and other.is_dir():
+            common_dirs.append(entry.name)
+        elif exclude is not None and exclude(entry.name):
+            logger.debug("File named '%s' is skipped (excluded).", entry.name)
+        elif other is None:
+            left_only.append(entry)
+        elif entry.is_file() and other.is_file():
+            try:
+                same = compare(entry.path, other.path, entry.stat(), other.stat())
+            except OSError:
+                continue
+            if not same:
+                diff_files.append(entry.name)
+    return _DirDiff(left_only, diff_files, common_dirs)
+
+
 class dircmp_deep(dircmp):
     """Deep directory comparator."""
 
     def phase3(self):
         """Find out differences between common files."""
-        xx = filecmp.cmpfiles(self.left, self.right, self.common_files, shallow=False)
-        self.same_files, self.diff_files, self.funny_files = xx
+        self.same_files, self.diff_files, self.funny_files = [], [], []
+        for fn in self.common_files:
+            a = os.path.join(self.left, fn)
+            b = os.path.join(self.right, fn)
+            try:
+                same = _cmp_deep(a, b, os.stat(a), os.stat(b))
+            except OSError:
+                self.funny_files.append(fn)
+            else:
+                if same:
+                    self.same_files.append(fn)
+                else:
+                    self.diff_files.append(fn)
 
     methodmap = dict(dircmp.methodmap)
     # The type check for the following line must be ignored.
@@ -104,12 +319,19 @@ class _DocProxy:
     dry_run : bool
         Do not actually perform any data modification operation, but still log
         the action (Default value = False).
+    journal : list
+        If provided, the previous value of every modified key is recorded in
+        this list, so that the modifications can be reverted with
+        :meth:`rollback`. In-place modifications of values that are not
+        mappings, e.g. lists, bypass the proxy and are not recorded
+        (Default value = None).
 
     """
 
-    def __init__(self, doc, dry_run=False):
+    def __init__(self, doc, dry_run=False, journal=None):
         self.doc = doc
         self.dry_run = dry_run
+        self._journal = journal
 
     def __str__(self):
         return "_DocProxy({})".format(str(self.doc))
@@ -118,11 +340,22 @@ class _DocProxy:
         return "_DocProxy({})".format(repr(self.doc))
 
     def __getitem__(self, key):
-        return self.doc[key]
+        value = self.doc[key]
+        if isinstance(value, Mapping):
+            # Nested mappings are proxied as well to track their modifications.
+            return type(self)(value, dry_run=self.dry_run, journal=self._journal)
+        return value
+
+    def _record(self, key):
+        if self._journal is not None:
+            self._journal.append((self.doc, key, self.doc.get(key, _MISSING)))
 
     def __setitem__(self, key, value):
-        logger.more(f"Set '{key}'='{value}'.")
+        if self.doc.get(key, _MISSING) == value:
+            return  # avoid writing to the backing store if nothing changes
+        logger.more("Set '%s'='%s'.", key, value)
         if not self.dry_run:
+            self._record(key)
             self.doc[key] = value
 
     def keys(self):
@@ -131,12 +364,30 @@ class _DocProxy:
 
     def clear(self):
         """Clear proxy data."""
-        self.doc.clear()
+        if not self.dry_run:
+            for key in self.doc.keys():
+                self._record(key)
+            self.doc.clear()
 
     def update(self, other):
         """Update proxy data with other."""
-        for key in other.keys():
-            self[key] = other[key]
+        if self.dry_run:
+            for key in other.keys():
+                self[key] = other[key]
+        else:
+            for key in other.keys():
+                self._record(key)
+            self.doc.update(other)
+            logger.more(f"Updated {len(other)} key(s).")
+
+    def rollback(self):
+        """Revert all modifications recorded in the journal."""
+        while self._journal:
+            doc, key, value = self._journal.pop()
+            if value is _MISSING:
+                del doc[key]
+            else:
+                doc[key] = value
 
     def __iter__(self):
         return iter(self.doc)
@@ -199,24 +450,28 @@ class _FileModifyProxy:
         self.group = group
         self.dry_run = dry_run
         self.stats = dict(num_files=0, volume=0) if collect_stats else None
+        self._stats_lock = threading.Lock()
+        # Thread pool for file transfers shared by all jobs of a project sync.
+        self.pool = None
 
     # Internal proxy functions
 
     def _copy(self, src, dst):
         """Copy src to dst."""
         if not self.dry_run:
-            shutil.copy(src, dst)
+            _copyfile(src, dst)
+            shutil.copymode(src, dst)
 
     def _copy_p(self, src, dst):
         """Copy src to dst with permissions."""
         if not self.dry_run:
-            shutil.copy(src, dst)
+            _copyfile(src, dst)
             shutil.copymode(src, dst)
 
     def _copy2(self, src, dst):
         """Copy src to dst with preserved metadata."""
         if not self.dry_run:
-            shutil.copy2(src, dst)
+            _copy2(src, dst)
 
     def _remove(self, path):
         """Remove path."""
@@ -227,7 +482,8 @@ class _FileModifyProxy:
 
     def remove(self, path):
         """Remove path."""
-        logger.more("Remove path '{}'.".format(os.path.relpath(path)))
+        if logger.isEnabledFor(LEVEL_MORE):
+            logger.more("Remove path '%s'.", os.path.relpath(path))
         self._remove(path)
 
     def copy(self, src, dst):
@@ -236,41 +492,46 @@ class _FileModifyProxy:
             print(os.path.relpath(src, self.root))
         if os.path.islink(src) and not self.follow_symlinks:
             link_target = os.readlink(src)
-            logger.more(
-                "Creating link '{}' -> '{}'.".format(
-                    os.path.relpath(dst), os.path.relpath(link_target)
+            if logger.isEnabledFor(LEVEL_MORE):
+                logger.more(
+                    "Creating link '%s' -> '%s'.",
+                    os.path.relpath(dst),
+                    os.path.relpath(link_target),
                 )
-            )
             if os.path.isfile(dst):
                 self.remove(dst)
             if not self.dry_run:
                 os.symlink(link_target, dst)
         else:
-            msg = "Copy file{{}} '{}' -> '{}'.".format(
-                os.path.relpath(src), os.path.relpath(dst)
-            )
             if self.permissions and self.times:
-                logger.more(msg.format(" (preserving: permissions, times)"))
-                self._copy2(src, dst)
+                preserving, copy = " (preserving: permissions, times)", self._copy2
             elif self.permissions:
-                logger.more(msg.format(" (preserving: permissions)"))
-                self._copy_p(src, dst)
+                preserving, copy = " (preserving: permissions)", self._copy_p
             elif self.times:
                 raise ValueError("Cannot copy timestamps without permissions.")
             else:
-                logger.more(msg.format(""))
-                self._copy(src, dst)
+                preserving, copy = "", self._copy
+            if logger.isEnabledFor(LEVEL_MORE):
+                logger.more(
+                    "Copy file%s '%s' -> '%s'.",
+                    preserving,
+                    os.path.relpath(src),
+                    os.path.relpath(dst),
+                )
+            copy(src, dst)
             if self.owner or self.group or self.stats is not None:
                 stat = os.stat(src)
                 if self.stats is not None:
-                    self.stats["num_files"] += 1
-                    self.stats["volume"] += stat.st_size
+                    with self._stats_lock:
+                        self.stats["num_files"] += 1
+                        self.stats["volume"] += stat.st_size
                 if self.owner or self.group:
-                    logger.more(
-                        "Copy owner/group '{}' -> '{}'".format(
-                            os.path.relpath(src), os.path.relpath(dst)
+                    if logger.isEnabledFor(LEVEL_MORE):
+                        logger.more(
+                            "Copy owner/group '%s' -> '%s'",
+                            os.path.relpath(src),
+                            os.path.relpath(dst),
                         )
-                    )
                     if not self.dry_run:
                         os.chown(
                             dst,
@@ -280,15 +541,17 @@ class _FileModifyProxy:
 
     def copytree(self, src, dst, **kwargs):
         """Copy tree src to dst."""
-        logger.more(
-            "Copy tree '{}' -> '{}'.".format(os.path.relpath(src), os.path.relpath(dst))
-        )
+        if logger.isEnabledFor(LEVEL_MORE):
+            logger.more(
+                "Copy tree '%s' -> '%s'.", os.path.relpath(src), os.path.relpath(dst)
+            )
         copytree(src, dst, copy_function=self.copy, **kwargs)
 
     @contextmanager
     def create_backup(self, path):
         """Create a backup of path."""
-        logger.debug("Create backup of '{}'.".format(os.path.relpath(path)))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Create backup of '%s'.", os.path.relpath(path))
         path_backup = path + "~"
         if os.path.isfile(path_backup):
             raise RuntimeError(
@@ -304,7 +567,8 @@ class _FileModifyProxy:
             self._copy2(path_backup, path)
             raise
         finally:
-            logger.debug("Remove backup of '{}'.".format(os.path.relpath(path)))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Remove backup of '%s'.", os.path.relpath(path))
             self._remove(path_backup)
 
     @contextmanager
@@ -312,7 +576,16 @@ class _FileModifyProxy:
         """Create a backup of doc."""
         proxy = _DocProxy(doc, dry_run=self.dry_run)
         fn = getattr(doc, "filename", getattr(doc, "_filename", None))
-        if not len(proxy) or fn is None or not os.path.isfile(fn):
+        if not len(proxy):
+            # An empty document is only modified through the proxy, hence an
+            # in-memory journal of these modifications suffices as backup.
+            proxy = _DocProxy(doc, dry_run=self.dry_run, journal=[])
+            try:
+                yield proxy
+            except:  # noqa roll-back
+                proxy.rollback()
+                raise
+        elif fn is None or not os.path.isfile(fn):
             backup = deepcopy(doc)  # use in-memory backup
             try:
                 yield proxy
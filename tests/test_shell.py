@@ -1,10 +1,12 @@
 # Copyright (c) 2017 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import io
 import json
 import os
 import subprocess
 import sys
+from contextlib import redirect_stdout
 from tempfile import TemporaryDirectory
 
 import pytest
@@ -95,6 +97,12 @@ class TestBasicShell:
         assert "positional arguments:" in out
         assert "optional arguments:" in out
 
+    def test_help_before_subcommand(self):
+        out = self.call("python -m signac -h find".split())
+        assert "find" in out
+        assert "statepoint" in out
+        assert "sync" in out
+
     def test_init_project(self):
         self.call("python -m signac init my_project".split())
         assert str(signac.get_project()) == "my_project"
@@ -159,6 +167,70 @@ class TestBasicShell:
         sp = self.call("python -m signac statepoint --pretty".split())
         assert "{'a': 0}" in sp
         assert len(project) == 1
+        sp = self.call("python -m signac statepoint --pretty 10".split())
+        assert json.loads(sp) == job.statepoint()
+        job_inf = project.open_job({"a": float("inf")}).init()
+        sp = self.call(f"python -m signac statepoint --pretty 10 {job_inf.id}".split())
+        assert '"a": Infinity' in sp
+
+    def test_statepoint_order(self):
+        self.call("python -m signac init my_project".split())
+        project = signac.Project()
+        for i in range(20):
+            project.open_job({"a": i}).init()
+        out = self.call("python -m signac statepoint".split())
+        statepoints = [json.loads(line) for line in out.splitlines()]
+        job_ids = self.call("python -m signac find".split()).split()
+        assert [project.open_job(sp).id for sp in statepoints] == job_ids
+
+    def call_main(self, args):
+        """Run the command line interface within this process."""
+        from signac.__main__ import main
+
+        out = io.StringIO()
+        argv, sys.argv = sys.argv, ["signac"] + args
+        try:
+            with redirect_stdout(out), pytest.raises(SystemExit) as exit_info:
+                main()
+        finally:
+            sys.argv = argv
+        assert exit_info.value.code == 0
+        return out.getvalue()
+
+    def test_statepoint_in_process(self):
+        self.call("python -m signac init my_project".split())
+        project = signac.Project()
+        job = project.open_job({"a": 0}).init()
+        out = self.call_main(["statepoint", job.id])
+        assert json.loads(out) == job.statepoint()
+
+    def test_project_config_change_in_process(self):
+        self.call("python -m signac init my_project".split())
+        out = self.call_main(["project", "-w"])
+        assert os.path.basename(out.strip()) == "workspace"
+        self.call_main(["config", "--local", "set", "workspace_dir", "ws2"])
+        out = self.call_main(["project", "-w"])
+        assert os.path.basename(out.strip()) == "ws2"
+
+    def test_statepoint_abbreviated_ids(self):
+        self.call("python -m signac init my_project".split())
+        project = signac.Project()
+        jobs = [project.open_job({"a": i}).init() for i in range(3)]
+        ids = [job.id[:8] for job in jobs]
+        out = self.call(["python", "-m", "signac", "statepoint"] + ids)
+        sps = [json.loads(line) for line in out.strip().splitlines()]
+        assert sps == [job.statepoint() for job in jobs]
+
+    def test_statepoint_close_match(self):
+        self.call("python -m signac init my_project".split())
+        project = signac.Project()
+        job = project.open_job({"a": 0})
+        job.init()
+        typo = "x" + job.id[1:6]
+        err = self.call(
+            f"python -m signac statepoint {typo}".split(), error=True, raise_error=False
+        )
+        assert f"Did you mean '{job.id}'?" in err
 
     # Index schema is changed
     @pytest.mark.xfail()
@@ -184,6 +256,42 @@ class TestBasicShell:
         assert "b" in doc
         assert doc["b"] == 0
 
+    def test_index_nonfinite(self):
+        self.call("python -m signac init my_project".split())
+        project = signac.Project()
+        project.open_job({"a": float("inf")}).init()
+        project.open_job({"a": 0}).init()
+        out = self.call("python -m signac project --index".split())
+        lines = out.splitlines()
+        assert len(lines) == 2
+        assert {json.loads(line)["sp"]["a"] for line in lines} == {0, float("inf")}
+        assert all(", " not in line for line in lines)
+
+    def test_find_index_file(self):
+        self.call("python -m signac init my_project".split())
+        project = signac.Project()
+        sps = [{"a": i} for i in range(3)] + [{"a": float("inf")}]
+        for sp in sps:
+            project.open_job(sp).init()
+        docs = [dict(sp=job.sp(), _id=job.id) for job in project]
+        with open("index.txt", "w") as file:
+            for doc in docs:
+                file.write(json.dumps(doc) + "\n")
+        with open("index.json", "w") as file:
+            json.dump(docs, file)
+        job_id = project.open_job({"a": 0}).id
+        for fn_index in ("index.txt", "index.json"):
+            out = self.call(f"python -m signac find sp.a 0 --index {fn_index}".split())
+            assert out.strip() == job_id
+
+    def test_read_index_array(self):
+        from signac.__main__ import _read_index
+
+        docs = [{"a": 0}, {"a": float("inf")}, {"a": 1.5}]
+        with open("index.json", "w") as file:
+            json.dump(docs, file)
+        assert list(_read_index(None, "index.json")) == docs
+
     def test_document(self):
         self.call("python -m signac init my_project".split())
         project = signac.Project()
@@ -243,6 +351,8 @@ class TestBasicShell:
         out = self.call("python -m signac find".split())
         job_ids = out.split(os.linesep)[:-1]
         assert set(job_ids) == {job.id for job in project.find_jobs()}
+        out = self.call("python -m signac -v --debug find".split())
+        assert set(out.split(os.linesep)[:-1]) == set(job_ids)
         assert (
             self.call("python -m signac find".split() + ['{"a": 0}']).strip()
             == next(iter(project.find_jobs({"a": 0}))).id
@@ -419,6 +529,15 @@ class TestBasicShell:
             self.call(f"python -m signac -v rm {job_to_remove.id}".split())
         assert job_to_remove not in project
 
+    def test_remove_parallel(self):
+        self.call("python -m signac init my_project".split())
+        project = signac.Project()
+        jobs = [project.open_job({"a": i}).init() for i in range(5)]
+        ids = [job.id for job in jobs[:4]]
+        out = self.call(["python", "-m", "signac", "rm", "-v", "--parallel", "2"] + ids)
+        assert out.split() == ids
+        assert list(project) == jobs[4:]
+
     def test_schema(self):
         self.call("python -m signac init my_project".split())
         project = signac.Project()
@@ -775,6 +894,18 @@ class TestBasicShell:
         expected = config.Config(cfg).write()
         assert out.split(os.linesep) == expected
 
+    def test_config_show_key(self):
+        self.call("python -m signac init my_project".split())
+        self.call("python -m signac config --local set x.y.z 1".split())
+        for key in ("x.y.z", "x y.z", "x y z"):
+            out = self.call(f"python -m signac config --local show {key}".split())
+            assert out.strip() == "1"
+        out = self.call("python -m signac config --local show x.y".split())
+        assert out.strip() == "z = 1"
+        for key in ("a.b", "x.y.z.w", "x.a x.y"):
+            out = self.call(f"python -m signac config --local show {key}".split())
+            assert out.strip() == "None"
+
     def test_config_set(self):
         self.call("python -m signac init my_project".split())
         self.call("python -m signac config set a b".split())
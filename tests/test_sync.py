@@ -10,12 +10,12 @@ import pytest
 from test_job import TestJobBase
 
 import signac
-from signac import sync
+from signac import sync, syncutil
 from signac.contrib.utility import _mkdir_p
 from signac.core.jsondict import JSONDict
 from signac.errors import DocumentSyncConflict, FileSyncConflict, SchemaSyncConflict
-from signac.sync import _FileModifyProxy
-from signac.syncutil import _DocProxy
+from signac.sync import _compile_exclude, _FileModifyProxy
+from signac.syncutil import _diff_dirs, _DocProxy
 
 
 def touch(fname, mode=0o666, dir_fd=None, **kwargs):
@@ -58,6 +58,23 @@ class TestDocProxy:
         assert proxy == proxy
         assert proxy == doc
 
+    def test_set_unchanged(self):
+        class Doc(dict):
+            num_writes = 0
+
+            def __setitem__(self, key, value):
+                self.num_writes += 1
+                super().__setitem__(key, value)
+
+        doc = Doc(a=0)
+        proxy = _DocProxy(doc)
+        proxy["a"] = 0
+        assert doc.num_writes == 0
+        proxy["a"] = 1
+        proxy["b"] = 0
+        assert doc.num_writes == 2
+        assert doc == dict(a=1, b=0)
+
     def test_dry_run(self):
         doc = dict(a=0)
         proxy = _DocProxy(doc, dry_run=True)
@@ -76,6 +93,68 @@ class TestDocProxy:
         assert proxy["a"] == 0
         assert proxy == proxy
         assert proxy == doc
+        proxy.clear()
+        assert doc == dict(a=0)
+
+    def test_clear_rollback(self):
+        doc = dict(a=0, b=dict(c=1))
+        proxy = _DocProxy(doc, journal=[])
+        proxy.clear()
+        assert doc == {}
+        proxy["a"] = 1
+        proxy.rollback()
+        assert doc == dict(a=0, b=dict(c=1))
+
+
+class TestDiffDirs:
+    def test_diff_dirs(self):
+        with TemporaryDirectory(prefix="signac_") as tmp:
+            left = os.path.join(tmp, "left")
+            right = os.path.join(tmp, "right")
+            for path in (left, right):
+                for dirname in ("subdir", "__pycache__", "type"):
+                    os.makedirs(os.path.join(path, dirname))
+                with open(os.path.join(path, "same.txt"), "w") as file:
+                    file.write("same")
+                with open(os.path.join(path, "diff.txt"), "w") as file:
+                    file.write(path)
+            os.rmdir(os.path.join(right, "type"))
+            touch(os.path.join(right, "type"))
+            touch(os.path.join(left, "b_only.txt"))
+            os.makedirs(os.path.join(left, "a_only"))
+            os.makedirs(os.path.join(left, "__pycache__", "x"))
+            diff = _diff_dirs(left, right)
+            assert [entry.name for entry in diff.left_only] == ["a_only", "b_only.txt"]
+            assert diff.diff_files == ["diff.txt"]
+            assert diff.common_dirs == ["subdir"]
+            diff = _diff_dirs(left, right, exclude=lambda name: name[0] in "bds")
+            assert [entry.name for entry in diff.left_only] == ["a_only"]
+            assert diff.diff_files == []
+            assert diff.common_dirs == ["subdir"]
+
+
+class TestCompileExclude:
+    def test_empty(self):
+        assert _compile_exclude([]) is None
+
+    def test_patterns(self):
+        exclude = _compile_exclude(["test", r"\.txt$", ".*xyz"])
+        assert exclude("test.py")
+        assert exclude("abcxyz")
+        assert not exclude("a.txt")
+        assert not exclude("abc")
+
+    def test_backreferences(self):
+        exclude = _compile_exclude([r"(a)\1", r"(b)\1", r"(?P<c>c)(?P=c)"])
+        assert exclude("aa")
+        assert exclude("bb")
+        assert exclude("cc")
+        assert not exclude("ab")
+
+    def test_global_flags(self):
+        exclude = _compile_exclude(["(?i)test", "abc"])
+        assert exclude("TEST")
+        assert exclude("abc")
 
 
 class TestFileModifyProxy:
@@ -91,6 +170,38 @@ class TestFileModifyProxy:
             assert os.path.isfile(fn_src)
             assert os.path.isfile(fn_dst)
 
+    @pytest.mark.skipif(
+        not hasattr(os, "copy_file_range"), reason="requires os.copy_file_range"
+    )
+    def test_copy_file_range_copies_nothing(self, monkeypatch):
+        # Some filesystems report zero copied bytes instead of an error.
+        monkeypatch.setattr(os, "copy_file_range", lambda *args: 0)
+        proxy = _FileModifyProxy()
+        with TemporaryDirectory(prefix="signac_") as tmp:
+            fn_src = os.path.join(tmp, "src.txt")
+            fn_dst = os.path.join(tmp, "dst.txt")
+            with open(fn_src, "w") as file:
+                file.write("test")
+            proxy.copy(fn_src, fn_dst)
+            with open(fn_dst) as file:
+                assert file.read() == "test"
+
+    def test_copy_not_linux(self, monkeypatch):
+        def copy_file_range(*args):
+            raise AssertionError("copy_file_range must only be used on Linux")
+
+        monkeypatch.setattr(syncutil, "fcntl", None)
+        monkeypatch.setattr(os, "copy_file_range", copy_file_range, raising=False)
+        proxy = _FileModifyProxy()
+        with TemporaryDirectory(prefix="signac_") as tmp:
+            fn_src = os.path.join(tmp, "src.txt")
+            fn_dst = os.path.join(tmp, "dst.txt")
+            with open(fn_src, "w") as file:
+                file.write("test")
+            proxy.copy(fn_src, fn_dst)
+            with open(fn_dst) as file:
+                assert file.read() == "test"
+
     def test_copy_dry_run(self):
         proxy = _FileModifyProxy(dry_run=True)
         with TemporaryDirectory(prefix="signac_") as tmp:
@@ -231,6 +342,37 @@ class TestFileModifyProxyDocBackup:
                 raise RuntimeError()
         assert len(self.doc) == 0
 
+    def test_create_doc_dict_nested_with_error(self):
+        self.doc.update({"a": 0, "b": {"c": 1}})
+        proxy = _FileModifyProxy()
+        with pytest.raises(RuntimeError):
+            with proxy.create_doc_backup(self.doc) as p:
+                p["a"] = 1
+                p["b"]["c"] = 2
+                p["b"]["d"] = 3
+                p.update({"a": 2, "e": 4})
+                raise RuntimeError()
+        assert self.doc == {"a": 0, "b": {"c": 1}}
+
+    def test_create_doc_dict_clear_with_error(self):
+        self.doc.update({"a": 1, "b": [1, 2]})
+        proxy = _FileModifyProxy()
+        with pytest.raises(RuntimeError):
+            with proxy.create_doc_backup(self.doc) as p:
+                p.clear()
+                p["c"] = 3
+                raise RuntimeError()
+        assert self.doc == {"a": 1, "b": [1, 2]}
+
+    def test_create_doc_dict_list_with_error(self):
+        self.doc.update({"a": 1, "b": [1, 2]})
+        proxy = _FileModifyProxy()
+        with pytest.raises(RuntimeError):
+            with proxy.create_doc_backup(self.doc) as p:
+                p["b"].append(3)
+                raise RuntimeError()
+        assert self.doc == {"a": 1, "b": [1, 2]}
+
     def test_create_doc_dict_with_error_dryrun(self):
         proxy = _FileModifyProxy(dry_run=True)
         with pytest.raises(RuntimeError):
@@ -321,6 +463,53 @@ class TestJobSync(TestJobBase):
         with open(job_dst.fn("subdir/test2")) as file:
             assert file.read() == "test2"
 
+    def test_file_sync_parallel(self):
+        job_dst = self.open_job({"a": 0})
+        job_src = self.open_job({"a": 1})
+        with job_src:
+            for i in range(10):
+                with open(f"test{i}", "w") as file:
+                    file.write(f"test{i}")
+            os.makedirs("subdir")
+            with open("subdir/test", "w") as file:
+                file.write("test")
+        job_dst.sync(job_src, recursive=True, parallel=2)
+        assert job_dst in self.project
+        for i in range(10):
+            with open(job_dst.fn(f"test{i}")) as file:
+                assert file.read() == f"test{i}"
+        with open(job_dst.fn("subdir/test")) as file:
+            assert file.read() == "test"
+
+    def test_file_sync_deep_large_files(self):
+        job_dst = self.open_job({"a": 0})
+        job_src = self.open_job({"a": 1})
+        data = os.urandom(3 << 20)
+        for job in (job_dst, job_src):
+            with job:
+                with open("test", "wb") as file:
+                    file.write(data)
+        job_dst.sync(job_src, deep=True)
+        with open(job_src.fn("test"), "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(bytes([data[-1] ^ 1]))
+        with pytest.raises(FileSyncConflict):
+            job_dst.sync(job_src, deep=True)
+
+    def test_file_sync_stat(self):
+        job_dst = self.open_job({"a": 0})
+        job_src = self.open_job({"a": 1})
+        for job in (job_dst, job_src):
+            with job:
+                with open("test", "w") as file:
+                    file.write("test")
+        os.utime(job_src.fn("test"), (0, 0))
+        job_dst.sync(job_src)
+        with pytest.raises(FileSyncConflict):
+            job_dst.sync(job_src, deep="stat")
+        os.utime(job_dst.fn("test"), (0, 0))
+        job_dst.sync(job_src, deep="stat")
+
     def _reset_differing_jobs(self, jobs):
         for i, job in enumerate(jobs):
             with job:
@@ -353,12 +542,9 @@ class TestJobSync(TestJobBase):
         job_dst.sync(job_src, sync.FileSync.always, exclude="test", recursive=True)
         assert differs("test")
         assert differs("subdir/test2")
-        job_dst.sync(
-            job_src,
-            sync.FileSync.always,
-            exclude=["test", "non-existent-key"],
-            recursive=True,
-        )
+        exclude = ["test", "non-existent-key"]
+        job_dst.sync(job_src, sync.FileSync.always, exclude=exclude, recursive=True)
+        assert exclude == ["test", "non-existent-key"]
         assert differs("test")
         assert differs("subdir/test2")
         sleep(1)
@@ -579,6 +765,21 @@ class TestProjectSync:
         assert len(self.project_a) == 4
         assert len(self.project_b) == 0
 
+    def test_parallel_conflict(self):
+        for i in range(40):
+            self._init_job(self.project_a.open_job({"a": i}), data="outdated")
+            job = self.project_b.open_job({"a": i})
+            self._init_job(job, data=i)
+            job.document["a"] = i
+        self.project_a.open_job({"a": 20}).document["a"] = "conflict"
+        with pytest.raises(DocumentSyncConflict):
+            self.project_a.sync(self.project_b, sync.FileSync.always, parallel=4)
+        # The files of a job are synchronized before its document.
+        for job in self.project_a:
+            if job.document.get("a") == job.sp.a:
+                with open(job.fn("test.txt")) as file:
+                    assert file.read() == str(job.sp.a)
+
     def test_doc_sync(self):
         self.project_a.document["a"] = 0
         assert "a" in self.project_a.document
@@ -633,6 +834,41 @@ class TestProjectSync:
         with open(job_a0.fn("text.txt")) as file:
             assert file.read() == "otherdata"
 
+    def test_parallel(self):
+        for i in range(20):
+            self._init_job(self.project_a.open_job({"a": i}), data="outdated")
+            self._init_job(self.project_b.open_job({"a": i}), data=i)
+            self._init_job(self.project_b.open_job({"a": i + 20}), data=i + 20)
+        self.project_a.sync(
+            self.project_b,
+            strategy=sync.FileSync.always,
+            check_schema=False,
+            parallel=4,
+        )
+        assert len(self.project_a) == len(self.project_b) == 40
+        for job in self.project_a:
+            with open(job.fn("test.txt")) as file:
+                assert file.read() == str(job.sp.a)
+
+    def test_parallel_shared_transfer_pool(self, monkeypatch):
+        pools = set()
+
+        def transfer_files(transfers, parallel, pool=None):
+            pools.add(pool)
+            transfer_files_(transfers, parallel, pool)
+
+        transfer_files_ = sync._transfer_files
+        monkeypatch.setattr(sync, "_transfer_files", transfer_files)
+        for i in range(20):
+            self._init_job(self.project_a.open_job({"a": i}), data="outdated")
+            self._init_job(self.project_b.open_job({"a": i}), data=i)
+        self.project_a.sync(self.project_b, strategy=sync.FileSync.always, parallel=4)
+        assert len(pools) == 1
+        assert None not in pools
+        for job in self.project_a:
+            with open(job.fn("test.txt")) as file:
+                assert file.read() == str(job.sp.a)
+
     def test_selection(self):
         self._setup_jobs()
         assert len(self.project_a) == len(self.project_b)